@@ -3,14 +3,23 @@
 # Deskripsi: Runner untuk modul image filtering. 
 
 from pathlib import Path
-from skimage import filters
 from skimage.morphology import disk 
+import backends
+import manifest
+import median
+import parallel
+import precision
+import profiling
+import recursive
+import results_store
+import scalespace
+import tiling
 import utils
 
 FILTER_CONFIG = [
     {
         "name": "gaussian_sigma1",       
-        "function": filters.gaussian,    
+        "function": scalespace.gaussian,    
         "base_params": {"sigma": 1.0},       
         "requires_gray": False, 
         "color_params": {"channel_axis": -1}, 
@@ -18,7 +27,7 @@ FILTER_CONFIG = [
     },
     {
         "name": "gaussian_sigma3",
-        "function": filters.gaussian,
+        "function": scalespace.gaussian,
         "base_params": {"sigma": 3.0},
         "requires_gray": False, 
         "color_params": {"channel_axis": -1}, 
@@ -26,23 +35,23 @@ FILTER_CONFIG = [
     },
     {
         "name": "median_disk3",
-        "function": filters.median,
+        "function": median.histogram_median,
         "base_params": {"footprint": disk(3)},   
-        "requires_gray": True, 
-        "color_params": {}, 
+        "requires_gray": False, 
+        "color_params": {"channel_axis": -1}, 
         "notes": "Salt-pepper removal, k=3"
     },
     {
         "name": "median_disk5",
-        "function": filters.median,
+        "function": median.histogram_median,
         "base_params": {"footprint": disk(5)},
-        "requires_gray": True, 
-        "color_params": {}, 
+        "requires_gray": False, 
+        "color_params": {"channel_axis": -1}, 
         "notes": "Strong Salt-pepper removal, k=5"
     },
     {
         "name": "sobel",
-        "function": filters.sobel,
+        "function": backends.sobel,
         "base_params": {},
         "requires_gray": True, 
         "color_params": {}, 
@@ -50,79 +59,207 @@ FILTER_CONFIG = [
     }
 ]
 
-def process_one_image(img_name, img, base_output_dir):
+# Entri opsional (flag --iir), tidak termasuk output default
+IIR_FILTER_CONFIG = [
+    {
+        "name": "gaussian_iir_sigma8",
+        "function": recursive.recursive_gaussian,
+        "base_params": {"sigma": 8.0},
+        "requires_gray": False,
+        "color_params": {"channel_axis": -1},
+        "notes": "Background smoothing, recursive (IIR), cost independent of sigma"
+    }
+]
+
+def filter_configs(iir=False):
+    """Entri yang dijalankan: FILTER_CONFIG, ditambah IIR_FILTER_CONFIG jika iir."""
+    return FILTER_CONFIG + IIR_FILTER_CONFIG if iir else FILTER_CONFIG
+
+def apply_filter(config, img, tile_budget=None, tile_workers=None):
+    """
+    Menerapkan satu entri FILTER_CONFIG ke img (array atau
+    utils.ImageBundle; versi gray diambil dari bundle), per strip jika
+    tile_budget diberikan. Hasil float mengikuti presisi aktif (upcast
+    ditandai lewat precision.check). Dipakai juga oleh streaming.py.
+    """
+    filter_func = config["function"]
+    # Ambil parameter dasar
+    params = config["base_params"].copy()
+    bundle = utils.as_bundle(img)
+    img_to_filter = bundle.image
+
+    if bundle.ndim == 3:
+        if config["requires_gray"]:
+            img_to_filter = bundle.gray
+        else:
+            # Jika tidak butuh gray, tambahkan params khusus warna
+            params.update(config["color_params"])
+
+    # Terapkan filter
+    filtered = tiling.apply(
+        filter_func, img_to_filter, params, max_bytes=tile_budget, workers=tile_workers
+    )
+    return precision.check(filtered, config["name"])
+
+def process_one_image(img_name, img, base_output_dir, incremental=False,
+                      tile_budget=None, tile_workers=None, profile=False,
+                      store=None, png=True, iir=False):
     """
-    Memproses satu gambar dengan semua filter di config.
+    Memproses satu gambar dengan semua filter di config (plus entri IIR
+    jika iir=True, lihat filter_configs).
+    Dengan incremental=True, filter yang output-nya masih sesuai
+    manifest (gambar, config, dan kode sama) tidak dihitung ulang.
+    tile_budget/tile_workers diteruskan ke tiling.apply.
+    profile=True menambahkan kolom timing per stage (lihat profiling.py).
+    store (results_store.ResultsStore) menyimpan setiap hasil sebagai .npy;
+    png=False melewati PNG per filter (comparison plot tetap dibuat).
     """
     print(f"\nMemproses image: {img_name}")
+    profiler = profiling.StageProfiler(
+        enabled=profile, wall_only=profiling.shared_process(tile_budget, tile_workers)
+    )
     
     img_output_dir = base_output_dir / img_name
-    is_color = img.ndim == 3
+    image_manifest = manifest.for_image(img_output_dir, img, __file__, enabled=incremental)
     
-    comparison_plots = {"Original": utils.to_gray(img)}
+    # Versi gray dihitung sekali, dipakai plot & filter yang butuh gray
+    bundle = utils.ImageBundle(img)
+    with profiler.stage("convert"):
+        comparison_plots = {"Original": bundle.gray}
 
     # 1. Simpan gambar original
-    utils.save_img(img_output_dir / f"{img_name}_original.png", img)
+    original_path = img_output_dir / f"{img_name}_original.png"
+    if not image_manifest.is_fresh("original", "original"):
+        with profiler.stage("save"):
+            utils.save_img(original_path, img)
+        image_manifest.record("original", "original", [original_path])
+    image_stages = profiler.pop(profiling.IMAGE_PREFIX)
 
     image_params_log = []
+    configs = filter_configs(iir)
 
     # 2. Loop melalui semua konfigurasi filter
-    for config in FILTER_CONFIG:
-        filter_func = config["function"]
-        # Ambil parameter dasar
-        params = config["base_params"].copy()
-        img_to_filter = img
-
-        if is_color:
-            if config["requires_gray"]:
-                img_to_filter = utils.to_gray(img)
-            else:
-                # Jika tidak butuh gray, tambahkan params khusus warna
-                params.update(config["color_params"])
-
-        # Terapkan filter
-        filtered_img = filter_func(img_to_filter, **params)
+    for config in configs:
+        output_filename = img_output_dir / f"{img_name}_{config['name']}.png"
+        outputs = [output_filename] if png else []
+        if store is not None:
+            outputs.append(store.path(img_name, config['name']))
+        if image_manifest.is_fresh(config['name'], config, outputs):
+            # Output lama masih valid: pakai log dari manifest; tile comparison
+            # dihitung ulang hanya jika comparison digambar ulang
+            comparison_plots[config['name']] = lambda c=config: utils.to_gray(
+                apply_filter(c, bundle, tile_budget, tile_workers)
+            )
+            image_params_log.append(image_manifest.log(config['name']))
+            continue
+
+        with profiler.stage("compute"):
+            filtered_img = apply_filter(config, bundle, tile_budget, tile_workers)
         
         # 3. Simpan hasil filter individual
-        output_filename = img_output_dir / f"{img_name}_{config['name']}.png"
-        utils.save_img(output_filename, filtered_img)
+        with profiler.stage("save"):
+            if png:
+                utils.save_img(output_filename, filtered_img)
+            if store is not None:
+                store.put(img_name, config['name'], filtered_img)
 
         # 4. Tambahkan ke dict plot perbandingan
-        comparison_plots[config['name']] = utils.to_gray(filtered_img)
+        with profiler.stage("convert"):
+            comparison_plots[config['name']] = utils.to_gray(filtered_img)
 
         # 5. Parameter untuk CSV
         log_entry = {"image": img_name, "filter_name": config['name'], "notes": config['notes']}
         log_entry.update(config["base_params"]) 
         image_params_log.append(log_entry)
+        image_manifest.record(config['name'], config, outputs, log_entry)
+        # Kolom timing setelah record: manifest hanya menyimpan parameter
+        log_entry.update(profiler.pop())
     
     # 6. Simpan plot perbandingan untuk gambar ini
     plot_filepath = base_output_dir / f"comparison_{img_name}.png"
-    utils.plot_comparison(comparison_plots, f"Filter Comparison for {img_name}", plot_filepath)
+    if not image_manifest.is_fresh("comparison", configs):
+        with profiler.stage("plot"):
+            comparison_plots = utils.load_comparison_tiles(comparison_plots)
+            utils.plot_comparison(comparison_plots, f"Filter Comparison for {img_name}", plot_filepath)
+        image_manifest.record("comparison", configs, [plot_filepath])
+    profiling.attach_image_stages(image_params_log, image_stages, profiler.pop(profiling.IMAGE_PREFIX))
+
+    # Manifest hanya ditulis setelah semua file benar-benar tersimpan
+    if incremental:
+        utils.flush_writer()
+    image_manifest.save()
 
     return image_params_log
 
 
-def run_all_filters(base_output_dir):
+def run_all_filters(base_output_dir, workers=None, incremental=False,
+                    tile_budget=None, tile_workers=None, profile=False,
+                    source=None, prefetch=2, store=None, png=True, iir=False):
     """
     Fungsi untuk memproses tiap gambar.
+    workers > 1 menyebar gambar ke process pool (lihat parallel.run_images).
+    incremental=True melewati output yang tidak berubah (lihat manifest.py).
+    tile_budget (byte) mengaktifkan mode tiled per strip (lihat tiling.py).
+    profile=True menambahkan kolom timing per stage dan filter_profile.csv.
+    source (direktori/glob) membaca gambar secara lazy dengan prefetch
+    (lihat utils.iter_images); default gambar bawaan.
+    store (results_store.ResultsStore) menyimpan setiap hasil sebagai .npy;
+    png=False hanya menulis ke store (PNG bisa di-export belakangan).
+    iir=True menambahkan IIR_FILTER_CONFIG (Gaussian rekursif).
     """
+    if not png and store is None:
+        raise ValueError("png=False membutuhkan store")
     print("--- 1. Menjalankan Modul Filtering---")
-    imgs = utils.load_images()
-    all_params_log = [] # List untuk menyimpan semua parameter di csv  
+    profiler = profiling.StageProfiler(enabled=profile, wall_only=profiling.shared_process())
+    with profiler.stage("load"):
+        imgs = utils.load_images() if source is None else utils.iter_images(source, prefetch)
+    all_params_log = parallel.run_images(
+        process_one_image, imgs, base_output_dir, workers=workers, incremental=incremental,
+        tile_budget=tile_budget, tile_workers=tile_workers, profile=profile,
+        store=store, png=png, iir=iir,
+    )
 
-    for img_name, img in imgs.items():
-        logs_from_image = process_one_image(img_name, img, base_output_dir)
-        all_params_log.extend(logs_from_image) 
+    # Pastikan semua PNG sudah tertulis (dan error-nya muncul) sebelum CSV
+    utils.flush_writer()
 
     csv_path = base_output_dir / "filter_parameters.csv"
-    utils.save_params_to_csv(csv_path, all_params_log)
+    columns = profiling.csv_columns(all_params_log) if profile else None
+    utils.save_params_to_csv(csv_path, all_params_log, columns=columns)
+
+    if profile:
+        summary = profiling.summarize(all_params_log, profiler.pop())
+        profiling.print_summary(summary)
+        utils.save_params_to_csv(base_output_dir / "filter_profile.csv", summary)
     
     print("\n--- Modul Filtering Selesai ---")
 
 
 def main():
+    parser = utils.build_arg_parser("Modul Image Filtering")
+    tiling.add_tiling_args(parser)
+    profiling.add_profile_args(parser)
+    results_store.add_store_args(parser)
+    parser.add_argument(
+        "--iir", action="store_true",
+        help="Tambahkan gaussian_iir_sigma8 (Gaussian rekursif, biaya konstan terhadap sigma)."
+    )
+    args = parser.parse_args()
+    if args.no_png and args.store is None:
+        parser.error("--no-png membutuhkan --store")
     output_dir = Path(__file__).resolve().parent
-    run_all_filters(output_dir)
+    precision.set_from_args(args)
+    backends.set_from_args(args)
+    utils.start_writer_from_args(args)
+    try:
+        run_all_filters(
+            output_dir, workers=args.workers, incremental=args.incremental,
+            tile_budget=tiling.budget_from_args(args), tile_workers=args.tile_workers,
+            profile=args.profile, source=args.source, prefetch=args.prefetch,
+            store=results_store.store_from_args(args, "filter"), png=not args.no_png,
+            iir=args.iir,
+        )
+    finally:
+        utils.stop_writer()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,114 +3,263 @@
 # Deskripsi: Runner untuk modul edge detection (Sobel & Canny).
 
 from pathlib import Path
-from skimage import filters, feature
 
+import backends
+import canny
+import manifest
+import parallel
+import precision
+import profiling
+import results_store
+import tiling
 import utils
 
 
 EDGE_CONFIG = [
     {
         "name": "sobel",
-        "function": filters.sobel,
+        "function": backends.sobel,
         "params": {}, 
         "notes": "Sobel"
     },
     {
         "name": "canny_sigma1_low_thresh",
-        "function": feature.canny,
+        "function": canny.canny,
         "params": {"sigma": 1.0, "low_threshold": 0.05, "high_threshold": 0.15},
         "notes": "Eksperimen Threshold: Sigma=1.0, Thresholds rendah"
     },
     {
         "name": "canny_sigma1_high_thresh",
-        "function": feature.canny,
+        "function": canny.canny,
         "params": {"sigma": 1.0, "low_threshold": 0.1, "high_threshold": 0.3},
         "notes": "Eksperimen Threshold: Sigma=1.0, Thresholds tinggi"
     },
     {
         "name": "canny_sigma3_low_thresh",
-        "function": feature.canny,
+        "function": canny.canny,
         "params": {"sigma": 3.0, "low_threshold": 0.05, "high_threshold": 0.15},
         "notes": "Eksperimen Threshold: Sigma=3.0, Thresholds rendah"
     },
     {
         "name": "canny_sigma3_high_thresh",
-        "function": feature.canny,
+        "function": canny.canny,
         "params": {"sigma": 3.0, "low_threshold": 0.1, "high_threshold": 0.3},
         "notes": "Eksperimen Threshold: Sigma=3.0, Thresholds tinggi"
     }
 ]
 
 
-def process_one_image(img_name, img, base_output_dir):
+def _run_canny_groups(image, configs=None):
+    """
+    Entri Canny di EDGE_CONFIG (atau configs) yang hanya berbeda threshold
+    dikelompokkan, lalu tiap kelompok dihitung sekali dengan canny.canny_multi.
+    image berupa gambar gray atau utils.ImageBundle.
+    Mengembalikan dict {nama config: edge map boolean}.
+    """
+    img_gray = utils.as_bundle(image).gray
+    groups = {}
+    for config in (EDGE_CONFIG if configs is None else configs):
+        if config["function"] is not canny.canny:
+            continue
+        shared = {k: v for k, v in config["params"].items()
+                  if k not in ("low_threshold", "high_threshold")}
+        groups.setdefault(tuple(sorted(shared.items())), []).append(config)
+
+    results = {}
+    for shared, configs in groups.items():
+        thresholds = [
+            (c["params"].get("low_threshold"), c["params"].get("high_threshold"))
+            for c in configs
+        ]
+        edge_maps = canny.canny_multi(img_gray, thresholds=thresholds, **dict(shared))
+        for config, edges in zip(configs, edge_maps):
+            results[config["name"]] = edges
+    return results
+
+
+def apply_edge(config, image, canny_results, tile_budget=None, tile_workers=None):
+    """
+    Edge map float (0-1) untuk satu entri EDGE_CONFIG. image berupa gambar
+    gray atau utils.ImageBundle. canny_results adalah hasil
+    _run_canny_groups. Dipakai juga oleh streaming.py.
+    """
+    # Canny mengembalikan boolean, Sobel mengembalikan float
+    # Kita konversi ke float (0-1, presisi aktif) agar konsisten saat disimpan
+    if config["name"] in canny_results:
+        return canny_results[config["name"]].astype(precision.float_dtype())
+    # Sobel bisa di-tile; Canny selalu utuh (hysteresis global)
+    edges = tiling.apply(
+        config["function"], utils.as_bundle(image).gray, config["params"].copy(),
+        max_bytes=tile_budget, workers=tile_workers,
+    )
+    return precision.check(edges, config["name"]).astype(precision.float_dtype(), copy=False)
+
+
+def process_one_image(img_name, img, base_output_dir, incremental=False,
+                      tile_budget=None, tile_workers=None, profile=False,
+                      store=None, png=True):
     """
     Memproses satu gambar dengan semua metode edge detection di config.
+    Dengan incremental=True, metode yang output-nya masih sesuai
+    manifest tidak dihitung ulang.
+    tile_budget/tile_workers diteruskan ke tiling.apply.
+    profile=True menambahkan kolom timing per stage (lihat profiling.py).
+    store (results_store.ResultsStore) menyimpan setiap hasil sebagai .npy
+    (Canny sebagai map bit); png=False melewati PNG per metode.
     """
     print(f"\nMemproses image: {img_name}")
+    profiler = profiling.StageProfiler(
+        enabled=profile, wall_only=profiling.shared_process(tile_budget, tile_workers)
+    )
     
     # Ubah gambar menjadi gambar grayscale
-    img_gray = utils.to_gray(img)
+    bundle = utils.ImageBundle(img)
+    with profiler.stage("convert"):
+        img_gray = bundle.gray
     
     img_output_dir = base_output_dir / img_name
+    image_manifest = manifest.for_image(img_output_dir, img, __file__, enabled=incremental)
     
     # Siapkan dict untuk plot perbandingan
     comparison_plots = {"Original (Grayscale)": img_gray}
 
-    utils.save_img(img_output_dir / f"{img_name}_original_gray.png", img_gray)
+    original_path = img_output_dir / f"{img_name}_original_gray.png"
+    if not image_manifest.is_fresh("original_gray", "original_gray"):
+        with profiler.stage("save"):
+            utils.save_img(original_path, img_gray)
+        image_manifest.record("original_gray", "original_gray", [original_path])
 
     image_params_log = []
 
+    def outputs(config):
+        paths = [img_output_dir / f"{img_name}_{config['name']}.png"] if png else []
+        if store is not None:
+            paths.append(store.path(img_name, config['name']))
+        return paths
+
+    stale_configs = [
+        c for c in EDGE_CONFIG if not image_manifest.is_fresh(c['name'], c, outputs(c))
+    ]
+    stale_names = {c['name'] for c in stale_configs}
+
+    # Canny dengan sigma sama: gradien + NMS sekali, hysteresis per threshold
+    with profiler.stage("compute"):
+        canny_results = _run_canny_groups(bundle, stale_configs)
+    image_stages = profiler.pop(profiling.IMAGE_PREFIX)
+
     for config in EDGE_CONFIG:
+        output_filename = img_output_dir / f"{img_name}_{config['name']}.png"
+        if config['name'] not in stale_names:
+            # Output lama masih valid: pakai log dari manifest; tile comparison
+            # dihitung ulang hanya jika comparison digambar ulang
+            comparison_plots[config['name']] = lambda c=config: apply_edge(
+                c, bundle, {}, tile_budget, tile_workers
+            )
+            image_params_log.append(image_manifest.log(config['name']))
+            continue
+
         print(f"  Menerapkan: {config['name']}...")
-        filter_func = config["function"]
-        params = config["params"].copy()
-        
-        # Terapkan filter
-        # Canny mengembalikan boolean, Sobel mengembalikan float
-        # Kita konversi ke float (0-1) agar konsisten saat disimpan
-        edge_img = filter_func(img_gray, **params).astype(float)
+        with profiler.stage("compute"):
+            edge_img = apply_edge(config, bundle, canny_results, tile_budget, tile_workers)
         
-        output_filename = img_output_dir / f"{img_name}_{config['name']}.png"
-        utils.save_img(output_filename, edge_img)
+        with profiler.stage("save"):
+            if png:
+                utils.save_img(output_filename, edge_img)
+            if store is not None:
+                # Canny disimpan sebagai map boolean (di-bit-pack oleh store)
+                store.put(img_name, config['name'], canny_results.get(config['name'], edge_img))
 
         comparison_plots[config['name']] = edge_img
 
         log_entry = {"image": img_name, "method": config['name'], "notes": config['notes']}
         log_entry.update(config["params"])
         image_params_log.append(log_entry)
+        image_manifest.record(config['name'], config, outputs(config), log_entry)
+        # Kolom timing setelah record: manifest hanya menyimpan parameter
+        log_entry.update(profiler.pop())
     
     # Simpan plot perbandingan untuk gambar ini
     plot_filepath = base_output_dir / f"comparison_{img_name}.png"
-    utils.plot_comparison(
-        comparison_plots, 
-        f"Edge Detection Comparison for {img_name}", 
-        plot_filepath
-    )
+    if not image_manifest.is_fresh("comparison", EDGE_CONFIG):
+        with profiler.stage("plot"):
+            utils.plot_comparison(
+                utils.load_comparison_tiles(comparison_plots), 
+                f"Edge Detection Comparison for {img_name}", 
+                plot_filepath
+            )
+        image_manifest.record("comparison", EDGE_CONFIG, [plot_filepath])
+    profiling.attach_image_stages(image_params_log, image_stages, profiler.pop(profiling.IMAGE_PREFIX))
+
+    # Manifest hanya ditulis setelah semua file benar-benar tersimpan
+    if incremental:
+        utils.flush_writer()
+    image_manifest.save()
 
     return image_params_log
 
 
-def run_all_edges(base_output_dir):
+def run_all_edges(base_output_dir, workers=None, incremental=False,
+                  tile_budget=None, tile_workers=None, profile=False,
+                  source=None, prefetch=2, store=None, png=True):
     """
     Fungsi utama yang me-loop semua gambar dan memanggil prosesor.
+    workers > 1 menyebar gambar ke process pool (lihat parallel.run_images).
+    incremental=True melewati output yang tidak berubah (lihat manifest.py).
+    tile_budget (byte) mengaktifkan mode tiled per strip (lihat tiling.py).
+    profile=True menambahkan kolom timing per stage dan edge_profile.csv.
+    source (direktori/glob) membaca gambar secara lazy dengan prefetch
+    (lihat utils.iter_images); default gambar bawaan.
+    store (results_store.ResultsStore) menyimpan setiap hasil sebagai .npy;
+    png=False hanya menulis ke store (PNG bisa di-export belakangan).
     """
+    if not png and store is None:
+        raise ValueError("png=False membutuhkan store")
     print("--- 2. Menjalankan Modul Edge Detection ---")
-    imgs = utils.load_images()
-    all_params_log = []
+    profiler = profiling.StageProfiler(enabled=profile, wall_only=profiling.shared_process())
+    with profiler.stage("load"):
+        imgs = utils.load_images() if source is None else utils.iter_images(source, prefetch)
+    all_params_log = parallel.run_images(
+        process_one_image, imgs, base_output_dir, workers=workers, incremental=incremental,
+        tile_budget=tile_budget, tile_workers=tile_workers, profile=profile,
+        store=store, png=png,
+    )
 
-    for img_name, img in imgs.items():
-        logs_from_image = process_one_image(img_name, img, base_output_dir)
-        all_params_log.extend(logs_from_image)
+    # Pastikan semua PNG sudah tertulis (dan error-nya muncul) sebelum CSV
+    utils.flush_writer()
 
     csv_path = base_output_dir / "edge_parameters.csv"
-    utils.save_params_to_csv(csv_path, all_params_log)
+    columns = profiling.csv_columns(all_params_log) if profile else None
+    utils.save_params_to_csv(csv_path, all_params_log, columns=columns)
+
+    if profile:
+        summary = profiling.summarize(all_params_log, profiler.pop())
+        profiling.print_summary(summary)
+        utils.save_params_to_csv(base_output_dir / "edge_profile.csv", summary)
     
     print("\n--- Modul Edge Detection Selesai ---")
 
 
 def main():
+    parser = utils.build_arg_parser("Modul Edge Detection")
+    tiling.add_tiling_args(parser)
+    profiling.add_profile_args(parser)
+    results_store.add_store_args(parser)
+    args = parser.parse_args()
+    if args.no_png and args.store is None:
+        parser.error("--no-png membutuhkan --store")
     output_dir = Path(__file__).resolve().parent
-    run_all_edges(output_dir)
+    precision.set_from_args(args)
+    backends.set_from_args(args)
+    utils.start_writer_from_args(args)
+    try:
+        run_all_edges(
+            output_dir, workers=args.workers, incremental=args.incremental,
+            tile_budget=tiling.budget_from_args(args), tile_workers=args.tile_workers,
+            profile=args.profile, source=args.source, prefetch=args.prefetch,
+            store=results_store.store_from_args(args, "edge"), png=not args.no_png,
+        )
+    finally:
+        utils.stop_writer()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,31 +4,69 @@
 
 import numpy as np
 from pathlib import Path
-from skimage import feature, img_as_float
+from skimage import feature
 import cv2
 
+import backends
+import harris
+import keypoints
+import manifest
+import parallel
+import precision
+import profiling
+import pyramid
 import utils  
 
 
-def _detect_harris(img_gray, **kwargs):
-    """ Helper untuk Harris (corner_harris + corner_peaks) """
+def _detect_harris(image, **kwargs):
+    """ Helper untuk Harris (corner_harris + corner_peaks). image: array gray atau ImageBundle """
     k = kwargs.get('k', 0.05)
     min_distance = kwargs.get('min_distance', 5)
     threshold_rel = kwargs.get('threshold_rel', 0.01)
 
-    response_img = feature.corner_harris(img_gray, k=k)
-    coords = feature.corner_peaks(response_img, 
-                                  min_distance=min_distance, 
-                                  threshold_rel=threshold_rel)
-    responses_at_coords = response_img[coords[:, 0], coords[:, 1]]
-    
-    return coords, responses_at_coords
+    # Response di-cache per (gambar, k); hasil sama dengan corner_peaks
+    img_gray = utils.as_bundle(image).float_gray
+    return harris.harris_multi(img_gray, k=k, queries=[(min_distance, threshold_rel)])[0]
 
-def _detect_orb(img_gray, **kwargs):
+def _run_harris_groups(image, configs=None):
+    """
+    Entri Harris di FEATURE_CONFIG (atau configs) dikelompokkan per k sehingga response
+    hanya dihitung sekali per kelompok; tiap entri hanya menjadi query
+    (min_distance, threshold_rel) pada PeakExtractor yang sama.
+    Mengembalikan dict {nama config: (coords, responses)}.
+    """
+    groups = {}
+    for config in (FEATURE_CONFIG if configs is None else configs):
+        if config["function"] is _detect_harris:
+            groups.setdefault(config["params"].get('k', 0.05), []).append(config)
+
+    results = {}
+    img_gray = utils.as_bundle(image).float_gray if groups else None
+    for k, configs in groups.items():
+        queries = [
+            (c["params"].get('min_distance', 5), c["params"].get('threshold_rel', 0.01))
+            for c in configs
+        ]
+        for config, result in zip(configs, harris.harris_multi(img_gray, k=k, queries=queries)):
+            results[config["name"]] = result
+    return results
+
+def _detect_orb(image, descriptors=False, **kwargs):
+    """
+    Helper untuk ORB. Dengan descriptors=True mengembalikan
+    (coords, responses, descriptors) dari detect_and_extract; descriptor
+    bool (N, 256) dapat langsung dipakai matching.match_binary.
+    """
+    img_gray = utils.as_bundle(image).float_gray
     # Ambil n_keypoints dari params
     n_keypoints = kwargs.get('n_keypoints', 200)
     
     detector = feature.ORB(n_keypoints=n_keypoints)
+    if descriptors:
+        # Keypoint di dekat tepi dibuang oleh extract, jadi coords bisa lebih sedikit
+        detector.detect_and_extract(img_gray)
+        return detector.keypoints, detector.responses, detector.descriptors
+
     detector.detect(img_gray)
     
     coords = detector.keypoints
@@ -36,32 +74,38 @@ def _detect_orb(img_gray, **kwargs):
     
     return coords, responses
 
-def detect_sift(image, n_keypoints=500):
+def _sift_input(image):
+    if isinstance(image, utils.ImageBundle) or image.dtype in (np.float32, np.float64):
+        return utils.as_bundle(image).gray_u8
+    return image.astype(np.uint8)
+
+def detect_sift(image, n_keypoints=500, descriptors=False):
     """
     Mendeteksi fitur SIFT menggunakan OpenCV (cv2) dan mengembalikan koordinatnya.
+    Dengan descriptors=True, descriptor float32 (N, 128) ikut dikembalikan
+    sebagai elemen ketiga (untuk matching.match_float).
+    image dapat berupa array atau ImageBundle (uint8 diambil dari bundle).
     Mengembalikan None jika library tidak ter-install.
     """
     sift = cv2.SIFT_create(nfeatures=n_keypoints)
+    img_uint8 = _sift_input(image)
 
-    if image.dtype in (np.float32, np.float64):
-        img_uint8 = (image * 255).astype(np.uint8)
-    else:
-        img_uint8 = image.astype(np.uint8)
+    if descriptors:
+        kps, desc = sift.detectAndCompute(img_uint8, None)
+        if not kps:
+            return np.empty((0, 2)), np.array([]), np.empty((0, 128), dtype=np.float32)
+        coords_rc, responses = keypoints.KeypointSet.from_cv2(kps).as_arrays()
+        return coords_rc, responses, desc
 
-    keypoints = sift.detect(img_uint8, None)
+    kps = sift.detect(img_uint8, None)
 
-    if not keypoints:
+    if not kps:
         return np.empty((0, 2)), np.array([]) 
 
-    coords_xy = np.array([kp.pt for kp in keypoints])
+    # (baris, kolom) & response langsung sebagai array, tanpa list per keypoint
+    return keypoints.KeypointSet.from_cv2(kps).as_arrays()
 
-    # coords_xy = np.array([kp.pt for kp in keypoints])
-    coords_rc = coords_xy[:, ::-1]
-    responses = np.array([kp.response for kp in keypoints])
-    
-    return coords_rc, responses
-
-def _detect_fast(img_gray, **kwargs):
+def _detect_fast(image, **kwargs):
     # n = kwargs.get('n', 9)
     # threshold = kwargs.get('threshold', 0.12)
     # resp = feature.corner_fast(img_gray, n=n, threshold=threshold)
@@ -75,17 +119,109 @@ def _detect_fast(img_gray, **kwargs):
     # Buat detektor FAST dengan Non-Maximum Suppression AKTIF (default)
     fast_detector = cv2.FastFeatureDetector_create(threshold=threshold, nonmaxSuppression=True)
     
-    img_uint8 = (img_gray * 255).astype(np.uint8)
-    keypoints = fast_detector.detect(img_uint8, None)
+    img_uint8 = utils.as_bundle(image).gray_u8
+    kps = fast_detector.detect(img_uint8, None)
 
-    if not keypoints:
+    if not kps:
         return np.empty((0, 2)), np.array([]) 
 
-    coords_xy = np.array([kp.pt for kp in keypoints])
-    coords_rc = coords_xy[:, ::-1]
-    responses = np.array([kp.response for kp in keypoints])
-    
-    return coords_rc, responses
+    return keypoints.KeypointSet.from_cv2(kps).as_arrays()
+
+
+# Lebar dukungan response Harris: turunan Sobel (1) + Gaussian sigma 1 (4)
+HARRIS_SUPPORT = 5
+# Keypoint ORB dibuang jika < 16 px dari tepi octave: 48 px cukup sampai
+# octave ke-6 (1.2^6 = 3.0); hanya octave terakhir yang terpotong di tepi
+# jendela, dengan biaya ~separuh halo 64
+ORB_HALO = 48
+# Halo SIFT: dukungan DoG untuk octave kecil; keypoint berskala besar
+# tetap ditemukan karena kandidatnya sudah ada di level kasar
+SIFT_HALO = 32
+
+
+def _harris_border_max(img_gray, k, width):
+    """
+    Maksimum response Harris resolusi penuh pada pita selebar width di
+    keempat tepi gambar. Setiap pita dihitung dari strip yang lebih lebar
+    HARRIS_SUPPORT piksel, sehingga hasilnya sama dengan response gambar penuh.
+    """
+    band = width + HARRIS_SUPPORT
+    if 2 * band >= min(img_gray.shape):
+        return backends.harris(img_gray, k=k).max()
+    return max(
+        backends.harris(img_gray[:band], k=k)[:width].max(),
+        backends.harris(img_gray[-band:], k=k)[-width:].max(),
+        backends.harris(img_gray[:, :band], k=k)[:, :width].max(),
+        backends.harris(img_gray[:, -band:], k=k)[:, -width:].max(),
+    )
+
+
+def _pyramid_harris(image, factor, k=0.05, min_distance=5, threshold_rel=0.01):
+    """Harris coarse-to-fine: peak level kasar -> response & peak per jendela."""
+    img_gray = utils.as_bundle(image).float_gray
+    coarse = backends.harris(pyramid.downsample(img_gray, factor), k=k)
+    candidates = harris.PeakExtractor(coarse).query(
+        max(1, min_distance // factor), threshold_rel * pyramid.CANDIDATE_RELAX
+    )
+    # corner_peaks mengambil threshold_rel dari maksimum global response, yang
+    # sering berada di pita tepi gambar (artefak padding nol, tidak pernah jadi
+    # peak); pita itu dihitung tepat, maksimum di dalamnya adalah peak terkuat
+    edge_max = _harris_border_max(img_gray, k, min_distance)
+
+    def detect_crop(crop):
+        return harris.local_peaks(backends.harris(crop, k=k), min_distance)
+
+    def select(coords, responses):
+        top = max(edge_max, responses.max()) if len(responses) else edge_max
+        threshold = threshold_rel * top
+        return harris.select_peaks(
+            coords.astype(np.intp), responses, img_gray.shape, min_distance, threshold
+        )
+
+    return pyramid.detect(
+        img_gray, candidates, factor, detect_crop, HARRIS_SUPPORT + min_distance, select
+    )
+
+def _pyramid_orb(image, factor, n_keypoints=200):
+    """ORB coarse-to-fine: n_keypoints terbaik dari semua jendela."""
+    img_gray = utils.as_bundle(image).float_gray
+    coarse = feature.ORB(n_keypoints=n_keypoints * pyramid.CANDIDATE_FACTOR)
+    coarse.detect(pyramid.downsample(img_gray, factor))
+
+    def detect_crop(crop):
+        detector = feature.ORB(n_keypoints=n_keypoints)
+        detector.detect(crop)
+        return detector.keypoints, detector.responses
+
+    return pyramid.detect(
+        img_gray, coarse.keypoints, factor, detect_crop, ORB_HALO, pyramid.top_n(n_keypoints)
+    )
+
+def _pyramid_sift(image, factor, n_keypoints=500):
+    """SIFT coarse-to-fine: n_keypoints terbaik dari semua jendela."""
+    img_uint8 = _sift_input(image)
+    coarse = cv2.SIFT_create(nfeatures=n_keypoints * pyramid.CANDIDATE_FACTOR)
+    kps = coarse.detect(pyramid.downsample(img_uint8, factor), None)
+    candidates = keypoints.KeypointSet.from_cv2(kps).coords if kps else np.empty((0, 2))
+    sift = cv2.SIFT_create(nfeatures=n_keypoints)
+
+    def detect_crop(crop):
+        kps = sift.detect(crop, None)
+        if not kps:
+            return np.empty((0, 2)), np.array([])
+        return keypoints.KeypointSet.from_cv2(kps).as_arrays()
+
+    return pyramid.detect(
+        img_uint8, candidates, factor, detect_crop, SIFT_HALO, pyramid.top_n(n_keypoints)
+    )
+
+# Detektor yang mendukung mode pyramid. FAST (OpenCV) tidak: deteksi penuh
+# pada 12 MP hanya ~20 ms, lebih cepat daripada membuat level kasarnya.
+PYRAMID_RULES = {
+    _detect_harris: _pyramid_harris,
+    _detect_orb: _pyramid_orb,
+    detect_sift: _pyramid_sift,
+}
 
 
 FEATURE_CONFIG = [
@@ -113,6 +249,13 @@ FEATURE_CONFIG = [
         "params": {"n": 9, "threshold": 30},
         "notes": "FAST-9: Threshold tinggi"
     },
+    {
+        "name": "fast_n9_thresh10_anms500",
+        "function": _detect_fast,
+        "params": {"n": 9, "threshold": 10},
+        "max_keypoints": 500,
+        "notes": "FAST-9: Threshold standar, 500 keypoint tersebar (ANMS)"
+    },
     {
         "name": "orb_200_features",
         "function": _detect_orb, 
@@ -134,107 +277,255 @@ FEATURE_CONFIG = [
 ]
 
 
-def process_one_image(img_name, img, base_output_dir):
+def uses_pyramid(config, shape, pyramid_levels):
+    """True jika entri config dideteksi coarse-to-fine untuk gambar berukuran shape."""
+    return config["function"] in PYRAMID_RULES and pyramid.enabled(shape, pyramid_levels)
+
+
+def detect_features(config, image, harris_results, pyramid_levels=0):
+    """
+    (coords, responses) untuk satu entri FEATURE_CONFIG, atau None jika
+    detektornya tidak tersedia. image berupa gambar gray float atau
+    utils.ImageBundle (konversi dibagi antar entri). harris_results adalah hasil
+    _run_harris_groups. Entri dengan "max_keypoints" disaring dengan ANMS
+    (keypoint kuat yang tersebar merata). Dipakai juga oleh streaming.py.
+    pyramid_levels > 0 mengaktifkan deteksi coarse-to-fine (PYRAMID_RULES)
+    untuk gambar besar (lihat pyramid.py).
+    """
+    if uses_pyramid(config, utils.as_bundle(image).shape, pyramid_levels):
+        factor = pyramid.factor_for(pyramid_levels)
+        coords, responses, coverage = PYRAMID_RULES[config["function"]](
+            image, factor, **config["params"]
+        )
+        print(f"    pyramid 1/{factor}: refine {coverage:.0%} luas gambar")
+        result = coords, responses
+    else:
+        result = _detect(config, image, harris_results)
+    # Opsional: batasi jumlah keypoint dengan ANMS (key "max_keypoints")
+    max_keypoints = config.get("max_keypoints")
+    if result is not None and max_keypoints is not None:
+        kept = keypoints.anms(result[0], result[1], max_keypoints)
+        result = result[0][kept], result[1][kept]
+    return result
+
+
+def _detect(config, image, harris_results):
+    func = config["function"]
+    params = config["params"].copy()
+
+    # Harris dan ORB mengembalikan (coords, responses)
+    if func in (_detect_harris, _detect_orb, _detect_fast):
+        if config["name"] in harris_results:
+            return harris_results[config["name"]]
+        return func(image, **params)
+
+    # elif func == feature.corner_fast:
+    #     coords = func(img_gray, **params)
+    #     num_features = len(coords)
+    #     mean_response = 'N/A' 
+
+    # elif func == _detect_fast:
+    #     img_gray_u8 = (img_gray * 255).astype(np.uint8)
+    #     coords = func(img_gray_u8, **params)
+    #     num_features = len(coords)
+    #     mean_response = 'N/A'
+
+    if func == detect_sift:
+        result = func(image, **params)
+        if result is None:
+            print("  SKIPPING SIFT (OpenCV tidak terinstall)")
+        return result
+
+    print(f"  SKIPPING: Fungsi {func} tidak dikenali")
+    return None
+
+
+def feature_log_entry(img_name, config, coords, responses):
+    """Baris CSV untuk satu entri FEATURE_CONFIG (dipakai juga oleh pipeline.py)."""
+    num_features = len(coords)
+    # float(): response float32 (mode float32) tetap ditulis sebagai angka
+    mean_response = float(responses.mean()) if responses.size > 0 else 0
+    log_entry = {
+        "image": img_name, 
+        "method": config['name'], 
+        "num_features": num_features,
+        "mean_response": f"{mean_response:.4f}" if isinstance(mean_response, (int, float)) else "N/A",
+        "notes": config['notes']
+    }
+    log_entry.update(config["params"])
+    if "max_keypoints" in config:
+        log_entry["max_keypoints"] = config["max_keypoints"]
+    return log_entry
+
+
+def _comparison_tile(config, bundle, pyramid_levels=0):
+    """Tile comparison satu entri: penanda keypoint di atas gambar gray float."""
+    result = detect_features(config, bundle, {}, pyramid_levels)
+    if result is None:
+        return None
+    return utils.create_marked_image(bundle.float_gray, result[0])
+
+def process_one_image(img_name, img, base_output_dir, incremental=False, profile=False,
+                      pyramid_levels=0):
     """
     Memproses satu gambar dengan semua metode feature detection di config.
+    Dengan incremental=True, metode yang output-nya masih sesuai
+    manifest tidak dihitung ulang.
+    profile=True menambahkan kolom timing per stage (lihat profiling.py).
+    pyramid_levels > 0 mendeteksi Harris/ORB/SIFT coarse-to-fine pada
+    gambar besar (lihat detect_features).
     """
     print(f"\nMemproses image: {img_name}")
+    profiler = profiling.StageProfiler(enabled=profile, wall_only=profiling.shared_process())
     
-    img_gray = utils.to_gray(img_as_float(img))
+    # Semua konversi (float, gray, uint8) dihitung sekali per gambar
+    bundle = utils.ImageBundle(img)
+    with profiler.stage("convert"):
+        img_gray = bundle.float_gray
     
     img_output_dir = base_output_dir / img_name
+    image_manifest = manifest.for_image(img_output_dir, img, __file__, enabled=incremental)
     
     comparison_plots = {"Original (Grayscale)": img_gray}
-    utils.save_img(img_output_dir / f"{img_name}_original_gray.png", img_gray)
+    original_path = img_output_dir / f"{img_name}_original_gray.png"
+    if not image_manifest.is_fresh("original_gray", "original_gray"):
+        with profiler.stage("save"):
+            utils.save_img(original_path, img_gray)
+        image_manifest.record("original_gray", "original_gray", [original_path])
     image_params_log = []
 
+    def fingerprint(config):
+        # Hasil mode pyramid berbeda dari resolusi penuh -> fingerprint sendiri
+        if uses_pyramid(config, bundle.shape, pyramid_levels):
+            return {**config, "pyramid_levels": pyramid_levels}
+        return config
+
+    stale_configs = [
+        c for c in FEATURE_CONFIG if not image_manifest.is_fresh(c['name'], fingerprint(c))
+    ]
+    stale_names = {c['name'] for c in stale_configs}
+
+    # Semua entri Harris dengan k sama memakai satu response map
+    # (entri mode pyramid tidak butuh response resolusi penuh)
+    full_res_configs = [
+        c for c in stale_configs if not uses_pyramid(c, bundle.shape, pyramid_levels)
+    ]
+    with profiler.stage("compute"):
+        harris_results = _run_harris_groups(bundle, full_res_configs)
+    image_stages = profiler.pop(profiling.IMAGE_PREFIX)
+
     for config in FEATURE_CONFIG:
+        output_filename = img_output_dir / f"{img_name}_{config['name']}.png"
+        if config['name'] not in stale_names:
+            # Output lama masih valid: pakai log dari manifest; tile comparison
+            # (penanda di atas gray) dihitung ulang hanya jika comparison
+            # digambar ulang
+            comparison_plots[config['name']] = lambda c=config: _comparison_tile(
+                c, bundle, pyramid_levels
+            )
+            image_params_log.append(image_manifest.log(config['name']))
+            continue
+
         print(f"  Menerapkan: {config['name']}...")
-        func = config["function"]
-        params = config["params"].copy()
-        
-        # Harris dan ORB mengembalikan (coords, responses)
-        if func in (_detect_harris, _detect_orb, _detect_fast):
-            coords, responses = func(img_gray, **params)
-            num_features = len(coords)
-            mean_response = responses.mean() if responses.size > 0 else 0
-        
-        # elif func == feature.corner_fast:
-        #     coords = func(img_gray, **params)
-        #     num_features = len(coords)
-        #     mean_response = 'N/A' 
-
-        # elif func == _detect_fast:
-        #     img_gray_u8 = (img_gray * 255).astype(np.uint8)
-        #     coords = func(img_gray_u8, **params)
-        #     num_features = len(coords)
-        #     mean_response = 'N/A'
-        
-        elif func == detect_sift: 
-            result = func(img_gray, **params)
-            
-            if result is None:
-                print("  SKIPPING SIFT (OpenCV tidak terinstall)")
-                continue 
-            
-            coords, responses = result
-            num_features = len(coords)
-            mean_response = responses.mean() if responses.size > 0 else 0
-        else:
-            print(f"  SKIPPING: Fungsi {func} tidak dikenali")
+        with profiler.stage("compute"):
+            result = detect_features(config, bundle, harris_results, pyramid_levels)
+        if result is None:
+            profiler.pop()
             continue
+        coords, responses = result
         
-        marked_image = utils.create_marked_image(img, coords)
+        with profiler.stage("mark"):
+            marked_image = utils.create_marked_image(bundle.float, coords)
         
-        output_filename = img_output_dir / f"{img_name}_{config['name']}.png"
-        utils.save_img(output_filename, marked_image)
+        with profiler.stage("save"):
+            utils.save_img(output_filename, marked_image)
 
-        gray_marked_image = utils.create_marked_image(img_gray, coords)
+        with profiler.stage("mark"):
+            gray_marked_image = utils.create_marked_image(img_gray, coords)
         comparison_plots[config['name']] = gray_marked_image
 
-        log_entry = {
-            "image": img_name, 
-            "method": config['name'], 
-            "num_features": num_features,
-            "mean_response": f"{mean_response:.4f}" if isinstance(mean_response, (int, float)) else "N/A",
-            "notes": config['notes']
-        }
-        log_entry.update(config["params"])
+        log_entry = feature_log_entry(img_name, config, coords, responses)
+        if uses_pyramid(config, bundle.shape, pyramid_levels):
+            log_entry["pyramid_levels"] = pyramid_levels
         image_params_log.append(log_entry)
+        image_manifest.record(config['name'], fingerprint(config), [output_filename], log_entry)
+        # Kolom timing setelah record: manifest hanya menyimpan parameter
+        log_entry.update(profiler.pop())
     
     plot_filepath = base_output_dir / f"comparison_{img_name}.png"
-    utils.plot_comparison(
-        comparison_plots, 
-        f"Feature Detection Comparison for {img_name}", 
-        plot_filepath
-    )
+    if not image_manifest.is_fresh("comparison", FEATURE_CONFIG):
+        with profiler.stage("plot"):
+            utils.plot_comparison(
+                utils.load_comparison_tiles(comparison_plots), 
+                f"Feature Detection Comparison for {img_name}", 
+                plot_filepath
+            )
+        image_manifest.record("comparison", FEATURE_CONFIG, [plot_filepath])
+    profiling.attach_image_stages(image_params_log, image_stages, profiler.pop(profiling.IMAGE_PREFIX))
+
+    # Manifest hanya ditulis setelah semua file benar-benar tersimpan
+    if incremental:
+        utils.flush_writer()
+    image_manifest.save()
 
     return image_params_log
 
 
-def run_all_features(base_output_dir):
+def run_all_features(base_output_dir, workers=None, incremental=False, profile=False,
+                     source=None, prefetch=2, pyramid_levels=0):
     """
     Fungsi utama yang me-loop semua gambar dan memanggil prosesor.
+    workers > 1 menyebar gambar ke process pool (lihat parallel.run_images).
+    incremental=True melewati output yang tidak berubah (lihat manifest.py).
+    profile=True menambahkan kolom timing per stage dan feature_profile.csv.
+    source (direktori/glob) membaca gambar secara lazy dengan prefetch
+    (lihat utils.iter_images); default gambar bawaan.
+    pyramid_levels > 0 mengaktifkan deteksi coarse-to-fine untuk gambar
+    besar (lihat pyramid.py).
     """
     print("--- 3. Menjalankan Modul Feature Detection ---")
-    imgs = utils.load_images()
-    all_params_log = []
-
+    profiler = profiling.StageProfiler(enabled=profile, wall_only=profiling.shared_process())
+    with profiler.stage("load"):
+        imgs = utils.load_images() if source is None else utils.iter_images(source, prefetch)
     # imgs.pop('checkerboard', None) 
 
-    for img_name, img in imgs.items():
-        logs_from_image = process_one_image(img_name, img, base_output_dir)
-        all_params_log.extend(logs_from_image)
+    all_params_log = parallel.run_images(
+        process_one_image, imgs, base_output_dir, workers=workers, incremental=incremental,
+        profile=profile, pyramid_levels=pyramid_levels,
+    )
+
+    # Pastikan semua PNG sudah tertulis (dan error-nya muncul) sebelum CSV
+    utils.flush_writer()
 
     csv_path = base_output_dir / "feature_parameters.csv"
-    utils.save_params_to_csv(csv_path, all_params_log)
+    columns = profiling.csv_columns(all_params_log) if profile else None
+    utils.save_params_to_csv(csv_path, all_params_log, columns=columns)
+
+    if profile:
+        summary = profiling.summarize(all_params_log, profiler.pop())
+        profiling.print_summary(summary)
+        utils.save_params_to_csv(base_output_dir / "feature_profile.csv", summary)
     
     print("\n--- Modul Feature Detection Selesai ---")
 
 
 def main():
+    parser = utils.build_arg_parser("Modul Feature Points Detection")
+    profiling.add_profile_args(parser)
+    pyramid.add_pyramid_args(parser)
+    args = parser.parse_args()
     output_dir = Path(__file__).resolve().parent
-    run_all_features(output_dir)
+    precision.set_from_args(args)
+    backends.set_from_args(args)
+    utils.start_writer_from_args(args)
+    try:
+        run_all_features(
+            output_dir, workers=args.workers, incremental=args.incremental,
+            profile=args.profile, source=args.source, prefetch=args.prefetch,
+            pyramid_levels=args.pyramid,
+        )
+    finally:
+        utils.stop_writer()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
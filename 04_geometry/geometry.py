@@ -1,10 +1,13 @@
 # Nama: Kayla Namira Mariadi
 # NIM: 13522050
+import argparse
 import matplotlib.pyplot as plt
 from pathlib import Path
 import numpy as np
 from pathlib import Path
-from skimage import transform, img_as_float
+from skimage import transform
+import precision
+import profiling
 import utils
 
 def save_matrix_to_txt(filepath, matrix, header=""):
@@ -50,35 +53,29 @@ def plot_transform_overlay(img_orig, img_warped, src_pts, dst_pts, title, filepa
     print(f"Overlay plot disimpan di: {filepath.name}")
 
 
-def run_all_transforms(base_output_dir):
+def corner_points(h, w):
     """
-    Fungsi utama untuk menjalankan simulasi transformasi.
+    Titik sumber: 4 sudut gambar (format: x, y / col, row).
     """
-    print("--- 4. Menjalankan Modul Geometry ---")
-    imgs = utils.load_images()
-    
-    # Kita hanya butuh checkerboard untuk modul ini
-    img_checker = imgs.get('checkerboard')
-    if img_checker is None:
-        print("ERROR: 'checkerboard' tidak ditemukan oleh utils.load_images().")
-        return
-        
-    # Pastikan grayscale dan float
-    img_checker = utils.to_gray(img_as_float(img_checker))
-    h, w = img_checker.shape
-    
-    # 1. Tentukan Titik Sumber (Source)
-    # Titik sumber adalah 4 sudut gambar (format: x, y / col, row)
-    src_pts_4 = np.array([
+    return np.array([
         [0, 0],     # Top-left
         [w - 1, 0],   # Top-right
         [w - 1, h - 1], # Bottom-right
         [0, h - 1]    # Bottom-left
     ])
+
+
+def build_transform_config(h, w):
+    """
+    TRANSFORM_CONFIG untuk gambar berukuran h x w. Titik tujuan bergantung
+    pada ukuran gambar, sehingga config dibangun per ukuran (dipakai juga
+    oleh benchmark.py).
+    """
+    src_pts_4 = corner_points(h, w)
     # Affine transform hanya butuh 3 titik
     src_pts_3 = src_pts_4[:3] 
 
-    TRANSFORM_CONFIG = [
+    return [
         {
             "name": "projective_transform",
             "transform_type": transform.ProjectiveTransform,
@@ -104,68 +101,130 @@ def run_all_transforms(base_output_dir):
         }
     ]
 
+
+def apply_transform(config, img):
+    """
+    Estimasi transformasi dari titik config lalu warp img.
+    Mengembalikan (transform, warped) atau (None, None) jika estimasi gagal.
+    """
+    t = config["transform_type"]()
+    if not t.estimate(config["src_points"], config["dst_points"]):
+        return None, None
+    # Kita gunakan t.inverse untuk memetakan piksel output kembali ke input.
+    # Warp sekali jalan: transform.warp (tabel remap.py hanya untung jika
+    # transformasi yang sama dipakai untuk banyak frame)
+    warped = transform.warp(img, t.inverse, output_shape=img.shape[:2])
+    return t, warped
+
+
+def overlay_dst_points(config, t, src_pts_4):
+    """4 titik tujuan untuk overlay (affine hanya punya 3 titik di config)."""
+    if config["transform_type"] == transform.AffineTransform:
+        # Hitung titik ke-4 secara manual untuk plot overlay affine
+        return t(src_pts_4)
+    return config["dst_points"]
+
+
+def save_transform_matrix(config, t, base_output_dir):
+    """Simpan matriks 3x3 hasil estimasi ke matrix_<nama>.txt."""
+    matrix_path = base_output_dir / f"matrix_{config['name']}.txt"
+    header = f"Matriks Estimasi ({config['name']})\n" + \
+             f"Tipe: {config['transform_type'].__name__}"
+    save_matrix_to_txt(matrix_path, t.params, header=header)
+
+
+def transform_log_entry(config):
+    """Baris worksheet untuk satu transformasi (dipakai juga oleh pipeline.py)."""
+    return {
+        "transform_name": config['name'],
+        "type": config['transform_type'].__name__,
+        "src_points_used": str(config["src_points"].tolist()),
+        "dst_points_used": str(config["dst_points"].tolist()),
+        "notes": config['notes']
+    }
+
+
+def run_all_transforms(base_output_dir, profile=False):
+    """
+    Fungsi utama untuk menjalankan simulasi transformasi.
+    profile=True menambahkan kolom timing per stage dan geometry_profile.csv.
+    """
+    print("--- 4. Menjalankan Modul Geometry ---")
+    profiler = profiling.StageProfiler(enabled=profile, wall_only=profiling.shared_process())
+    with profiler.stage("load"):
+        imgs = utils.load_images()
+    
+    # Kita hanya butuh checkerboard untuk modul ini
+    img_checker = imgs.get('checkerboard')
+    if img_checker is None:
+        print("ERROR: 'checkerboard' tidak ditemukan oleh utils.load_images().")
+        return
+        
+    # Pastikan grayscale dan float
+    with profiler.stage("convert"):
+        img_checker = utils.ImageBundle(img_checker).float_gray
+    run_stages = profiler.pop()
+    h, w = img_checker.shape
+    
+    # 1-2. Titik sumber (4 sudut gambar) & konfigurasi transformasi
+    src_pts_4 = corner_points(h, w)
+    TRANSFORM_CONFIG = build_transform_config(h, w)
+
     all_params_log = [] 
 
     # 3. Loop dan jalankan setiap transformasi
     for config in TRANSFORM_CONFIG:
         print(f"  Menerapkan: {config['name']}...")
-        
-        # Inisialisasi transformasi
-        t = config["transform_type"]()
-        src_pts = config["src_points"]
-        dst_pts = config["dst_points"]
 
-        # 4. Estimasi Matriks
-        if not t.estimate(src_pts, dst_pts):
+        # 4-5. Estimasi matriks & warp
+        with profiler.stage("compute"):
+            t, warped_img = apply_transform(config, img_checker)
+        if t is None:
             print(f"  ERROR: Estimasi matriks gagal untuk {config['name']}")
+            profiler.pop()
             continue
             
-        matrix = t.params # Ini adalah matriks 3x3 yang kita cari
-
-        # 5. Terapkan Transformasi (Warp)
-        # Kita gunakan t.inverse untuk memetakan piksel output kembali ke input
-        warped_img = transform.warp(img_checker, t.inverse, output_shape=(h, w))
-        
         # 6. Buat Overlay Plot
         # Untuk plotting, kita butuh 4 titik tujuan
-        if config["transform_type"] == transform.AffineTransform:
-            # Hitung titik ke-4 secara manual untuk plot overlay affine
-            plot_dst_pts = t(src_pts_4)
-        else:
-            plot_dst_pts = dst_pts
+        plot_dst_pts = overlay_dst_points(config, t, src_pts_4)
             
         plot_path = base_output_dir / f"overlay_{config['name']}.png"
-        plot_transform_overlay(
-            img_checker, warped_img, src_pts_4, plot_dst_pts, 
-            config['name'], plot_path
-        )
+        with profiler.stage("plot"):
+            plot_transform_overlay(
+                img_checker, warped_img, src_pts_4, plot_dst_pts, 
+                config['name'], plot_path
+            )
 
-        # 7. Simpan Matriks Parameter
-        matrix_path = base_output_dir / f"matrix_{config['name']}.txt"
-        header = f"Matriks Estimasi ({config['name']})\n" + \
-                 f"Tipe: {config['transform_type'].__name__}"
-        save_matrix_to_txt(matrix_path, matrix, header=header)
+        # 7. Simpan Matriks Parameter (t.params: matriks 3x3 yang kita cari)
+        with profiler.stage("save"):
+            save_transform_matrix(config, t, base_output_dir)
 
         # 8. Siapkan Log untuk Worksheet
-        log_entry = {
-            "transform_name": config['name'],
-            "type": config['transform_type'].__name__,
-            "src_points_used": str(src_pts.tolist()),
-            "dst_points_used": str(dst_pts.tolist()),
-            "notes": config['notes']
-        }
+        log_entry = transform_log_entry(config)
+        log_entry.update(profiler.pop())
         all_params_log.append(log_entry)
 
     # 9. Simpan Worksheet
     csv_path = base_output_dir / "geometry_worksheet.csv"
-    utils.save_params_to_csv(csv_path, all_params_log)
+    columns = profiling.csv_columns(all_params_log) if profile else None
+    utils.save_params_to_csv(csv_path, all_params_log, columns=columns)
+
+    if profile:
+        summary = profiling.summarize(all_params_log, run_stages)
+        profiling.print_summary(summary)
+        utils.save_params_to_csv(base_output_dir / "geometry_profile.csv", summary)
     
     print("\n--- Modul Geometry Selesai ---")
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Modul Geometry Transformation")
+    profiling.add_profile_args(parser)
+    precision.add_precision_args(parser)
+    args = parser.parse_args()
+    precision.set_from_args(args)
     output_dir = Path(__file__).resolve().parent
-    run_all_transforms(output_dir)
+    run_all_transforms(output_dir, profile=args.profile)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,547 @@
+# Nama: Kayla Namira Mariadi
+# NIM: 13522050
+# Deskripsi: Benchmark setiap entri FILTER_CONFIG, EDGE_CONFIG,
+#            FEATURE_CONFIG, dan TRANSFORM_CONFIG pada gambar sintetis dan
+#            bawaan di berbagai resolusi (sampai 8K), dengan mode compare
+#            untuk mendeteksi regresi terhadap baseline.
+
+import argparse
+import importlib
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import skimage
+from skimage import feature, img_as_ubyte, transform
+from skimage.morphology import disk
+
+import backends
+import canny
+import keypoints
+import median
+import precision
+import pyramid
+import remap
+import scalespace
+import utils
+
+filtering = importlib.import_module("01_filtering.filtering")
+edge_detection = importlib.import_module("02_edge.edge_detection")
+featurepoints = importlib.import_module("03_featurepoints.featurepoints")
+geometry = importlib.import_module("04_geometry.geometry")
+
+# nama -> (tinggi, lebar)
+SIZES = {
+    "vga": (480, 640),
+    "hd": (720, 1280),
+    "fhd": (1080, 1920),
+    "4k": (2160, 3840),
+    "8k": (4320, 7680),
+}
+DEFAULT_SIZES = ("vga", "hd", "fhd")
+DEFAULT_SOURCES = ("synthetic", "cameraman", "astronaut")
+MODULES = ("filter", "edge", "feature", "geometry")
+
+# Toleransi default mode compare: lebih lambat / lebih boros > 15% = regresi
+DEFAULT_THRESHOLD = 0.15
+# Waktu di bawah ini terlalu berisik untuk dibandingkan secara relatif
+MIN_COMPARE_SECONDS = 0.005
+
+RESULT_KEYS = ("module", "entry", "source", "size")
+
+# Mode --median-radii: waktu median boleh naik paling banyak 2x dari radius
+# terkecil ke terbesar (biaya per piksel praktis tidak bergantung radius)
+MEDIAN_FLAT_LIMIT = 2.0
+
+# Mode --pyramid-check: min_distance Harris yang dibandingkan dengan corner_peaks
+PYRAMID_CHECK_DISTANCES = (5, 10, 20, 40)
+
+# Mode --knn-check: k yang dicek untuk GridIndex.query_knn (None = lebih dari N)
+KNN_CHECK_K = (1, 4, 16, 64, None)
+
+# Mode --remap-frames: cv2.remap membulatkan posisi sampel ke 1/32 piksel,
+# jadi selisih dengan transform.warp paling banyak ~1/32 rentang intensitas
+REMAP_MAX_DIFF = 1 / 32
+
+
+# ---------------------------------------------------------------------------
+# Gambar input
+# ---------------------------------------------------------------------------
+
+def synthetic_image(height, width, seed=0):
+    """
+    Gambar RGB float [0, 1] deterministik: tekstur sinus (banyak sudut),
+    pola kotak (tepi tajam), dan noise ringan.
+    """
+    rng = np.random.default_rng(seed)
+    y = np.linspace(0.0, 1.0, height)[:, None]
+    x = np.linspace(0.0, 1.0, width)[None, :]
+    texture = 0.5 + 0.25 * np.sin(2 * np.pi * 8 * x) * np.cos(2 * np.pi * 6 * y)
+    blocks = (((x * 16).astype(int) + (y * 9).astype(int)) % 2) * 0.3
+
+    img = np.empty((height, width, 3))
+    img[..., 0] = texture + blocks
+    img[..., 1] = 1.0 - texture
+    img[..., 2] = blocks + 0.35
+    img += rng.normal(0.0, 0.02, size=img.shape)
+    return np.clip(img, 0.0, 1.0, out=img)
+
+
+def load_source(source, size, sample_images):
+    """Gambar sumber pada resolusi size (gambar bawaan di-resize bilinear)."""
+    height, width = SIZES[size]
+    if source == "synthetic":
+        return precision.cast(synthetic_image(height, width))
+    if source not in sample_images:
+        raise ValueError(f"sumber gambar tidak dikenal: {source}")
+    img = sample_images[source]
+    resized = transform.resize(img, (height, width), order=1, anti_aliasing=False)
+    # Gambar gray bawaan tetap uint8 seperti di utils.load_images
+    return img_as_ubyte(resized) if img.dtype == np.uint8 else precision.cast(resized)
+
+
+# ---------------------------------------------------------------------------
+# Entri benchmark: (modul, nama entri, fungsi tanpa argumen)
+# ---------------------------------------------------------------------------
+
+def iter_cases(img, modules):
+    """
+    Yield (modul, nama entri, callable) untuk setiap entri config yang
+    dijalankan pada img, dengan persiapan input yang sama seperti runner.
+    Setiap entri diukur sendiri-sendiri (tanpa berbagi hasil antar entri).
+    """
+    if "filter" in modules:
+        for config in filtering.filter_configs(iir=True):
+            yield "filter", config["name"], lambda c=config: filtering.apply_filter(c, img)
+
+    # Konversi dibagi antar modul; setiap entri tetap menerima array
+    bundle = utils.ImageBundle(img)
+    if "edge" in modules:
+        img_gray = bundle.gray
+        for config in edge_detection.EDGE_CONFIG:
+            if config["function"] is canny.canny:
+                fn = lambda c=config: canny.canny(img_gray, **c["params"])
+            else:
+                fn = lambda c=config: edge_detection.apply_edge(c, img_gray, {})
+            yield "edge", config["name"], fn
+
+    if "feature" in modules:
+        feature_gray = bundle.float_gray
+        for config in featurepoints.FEATURE_CONFIG:
+            yield "feature", config["name"], (
+                lambda c=config: featurepoints.detect_features(c, feature_gray, {})
+            )
+
+    if "geometry" in modules:
+        geometry_gray = bundle.float_gray
+        h, w = geometry_gray.shape
+        for config in geometry.build_transform_config(h, w):
+            yield "geometry", config["name"], (
+                lambda c=config: geometry.apply_transform(c, geometry_gray)
+            )
+
+
+def measure(fn, repeat=3):
+    """
+    Median & minimum wall time dari `repeat` kali eksekusi, lalu satu
+    eksekusi terpisah di bawah tracemalloc untuk peak memori (tracemalloc
+    memperlambat eksekusi, jadi tidak dipakai saat mengukur waktu).
+    Cache scale-space dan tabel remap dikosongkan sebelum setiap eksekusi.
+    """
+    times = []
+    for _ in range(max(1, repeat)):
+        _clear_caches()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    _clear_caches()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    _clear_caches()
+    return float(np.median(times)), float(min(times)), peak
+
+
+def _clear_caches():
+    scalespace.CACHE.clear()
+    remap.CACHE.clear()
+
+
+def median_radius_sweep(radii, size="fhd", repeat=3):
+    """
+    Waktu median.histogram_median satu channel uint8 untuk footprint disk
+    dan persegi pada setiap radius. Mengembalikan list hasil dengan kolom
+    ratio = waktu / waktu radius pertama untuk bentuk yang sama.
+    """
+    img = img_as_ubyte(synthetic_image(*SIZES[size])[..., 0])
+    results = []
+    for shape, make in (("disk", disk), ("square", lambda r: np.ones((2 * r + 1,) * 2, bool))):
+        first = None
+        for radius in radii:
+            footprint = make(radius)
+            wall, wall_min, _ = measure(lambda: median.histogram_median(img, footprint), repeat)
+            first = wall_min if first is None else first
+            row = {
+                "shape": shape,
+                "radius": radius,
+                "size": size,
+                "wall_s": wall,
+                "wall_min_s": wall_min,
+                "ratio": wall_min / first,
+            }
+            results.append(row)
+            print(f"  {shape:<7} r={radius:<3} {wall_min * 1000:9.1f} ms  x{row['ratio']:.2f}")
+    return results
+
+
+def pyramid_harris_check(img, levels, distances=PYRAMID_CHECK_DISTANCES, k=0.05,
+                         threshold_rel=0.01):
+    """
+    Bandingkan Harris mode pyramid dengan feature.corner_peaks resolusi
+    penuh untuk setiap min_distance. extra = peak pyramid yang tidak ada di
+    hasil penuh (harus 0: threshold & seleksi sama), recall = fraksi peak
+    penuh yang ditemukan lagi (bergantung kandidat level kasar).
+    """
+    img_gray = utils.ImageBundle(img).float_gray
+    response = feature.corner_harris(img_gray, k=k)
+    results = []
+    for d in distances:
+        full = feature.corner_peaks(response, min_distance=d, threshold_rel=threshold_rel)
+        coords, _, coverage = featurepoints._pyramid_harris(
+            img_gray, pyramid.factor_for(levels), k=k, min_distance=d, threshold_rel=threshold_rel
+        )
+        full_set = set(map(tuple, full.tolist()))
+        found = set(map(tuple, np.asarray(coords, dtype=int).tolist()))
+        row = {
+            "min_distance": d,
+            "full": len(full_set),
+            "pyramid": len(found),
+            "extra": len(found - full_set),
+            "recall": len(found & full_set) / len(full_set) if full_set else 1.0,
+            "coverage": coverage,
+        }
+        results.append(row)
+        print(
+            f"  min_distance {d:>3}: penuh {row['full']:>5}  pyramid {row['pyramid']:>5}  "
+            f"extra {row['extra']:>3}  recall {row['recall']:6.1%}  jendela {coverage:5.1%}"
+        )
+    return results
+
+
+def grid_knn_check(n_points, n_queries=500, seed=0):
+    """
+    Bandingkan GridIndex.query_knn dan query_radius dengan brute force pada
+    n_points titik acak (sebagian menumpuk di satu cluster) di gambar VGA.
+    Sepertiga query berada jauh di luar bounding box titik. Jarak hasil
+    harus sama persis dengan jarak terurut brute force (seri boleh beda
+    indeks). Mengembalikan jumlah query yang tidak cocok per k.
+    """
+    rng = np.random.default_rng(seed)
+    height, width = SIZES["vga"]
+    coords = rng.uniform((0, 0), (height, width), (n_points, 2))
+    coords[: n_points // 4] = rng.normal((100, 150), 5, (n_points // 4, 2))
+    queries = rng.uniform((0, 0), (height, width), (n_queries, 2))
+    queries[: n_queries // 3] = rng.uniform(-20 * width, 20 * width, (n_queries // 3, 2))
+    grid = keypoints.GridIndex(coords)
+
+    results = []
+    for k in KNN_CHECK_K:
+        k = n_points + 5 if k is None else k
+        bad_knn = bad_radius = 0
+        for point in queries:
+            dist = np.hypot(*(coords - point).T)
+            expected = np.sort(dist)[:k]
+            found = grid.query_knn(point, k)
+            bad_knn += not np.array_equal(dist[found], expected)
+            radius = expected[-1]
+            bad_radius += not np.array_equal(
+                np.sort(grid.query_radius(point, radius)), np.flatnonzero(dist <= radius)
+            )
+        row = {"points": n_points, "k": k, "queries": n_queries,
+               "bad_knn": bad_knn, "bad_radius": bad_radius}
+        results.append(row)
+        print(f"  N={n_points:<6} k={k:<6} query_knn salah {bad_knn:>4}  query_radius salah {bad_radius:>4}")
+    return results
+
+
+def remap_stack_check(frames, size="fhd", repeat=3):
+    """
+    Waktu warp `frames` frame gray (synthetic digeser per frame) dengan
+    transformasi proyektif TRANSFORM_CONFIG: loop transform.warp per frame,
+    remap.warp_stack dengan tabel baru (cache dikosongkan, termasuk membangun
+    tabel), dan warp_stack dengan tabel dari cache. Juga selisih maksimum
+    terhadap transform.warp dan ukuran tabel.
+    """
+    height, width = SIZES[size]
+    gray = utils.ImageBundle(synthetic_image(height, width)).float_gray
+    stack = np.stack([np.roll(gray, 8 * i, axis=1) for i in range(frames)])
+    config = geometry.build_transform_config(height, width)[0]
+    t = config["transform_type"]()
+    t.estimate(config["src_points"], config["dst_points"])
+
+    def warp_loop():
+        return [transform.warp(frame, t.inverse, output_shape=(height, width)) for frame in stack]
+
+    loop_s, loop_min_s, _ = measure(warp_loop, repeat)
+    cold_s, cold_min_s, _ = measure(lambda: remap.warp_stack(stack, t.inverse), repeat)
+    remap.warp_stack(stack, t.inverse)
+    warm = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        warped = remap.warp_stack(stack, t.inverse)
+        warm.append(time.perf_counter() - start)
+    table = remap.remap_table(t.inverse, (height, width))
+    diff = max(float(np.max(np.abs(w - r))) for w, r in zip(warped, warp_loop()))
+    remap.CACHE.clear()
+
+    row = {
+        "frames": frames,
+        "size": size,
+        "warp_loop_s": loop_min_s,
+        "warp_stack_cold_s": cold_min_s,
+        "warp_stack_cached_s": min(warm),
+        "table_mb": table.nbytes / 2**20,
+        "max_abs_diff": diff,
+    }
+    print(
+        f"  {frames} x {size}: transform.warp {loop_min_s * 1000:8.1f} ms  "
+        f"warp_stack {cold_min_s * 1000:8.1f} ms (tabel baru) / "
+        f"{row['warp_stack_cached_s'] * 1000:8.1f} ms (cache)  "
+        f"tabel {row['table_mb']:.1f} MB  selisih maks {diff:.4f}"
+    )
+    return row
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, sources=DEFAULT_SOURCES, modules=MODULES,
+                   entries=None, repeat=3):
+    """
+    Menjalankan semua kombinasi (sumber, ukuran, entri). entries (list
+    substring) membatasi entri yang dijalankan. Mengembalikan list hasil.
+    """
+    sample_images = {}
+    if any(source != "synthetic" for source in sources):
+        sample_images = utils.load_images()
+
+    results = []
+    for size in sizes:
+        for source in sources:
+            img = load_source(source, size, sample_images)
+            megapixels = img.shape[0] * img.shape[1] / 1e6
+            for module, entry, fn in iter_cases(img, modules):
+                if entries and not any(pattern in entry for pattern in entries):
+                    continue
+                wall, wall_min, peak = measure(fn, repeat)
+                row = {
+                    "module": module,
+                    "entry": entry,
+                    "source": source,
+                    "size": size,
+                    "height": img.shape[0],
+                    "width": img.shape[1],
+                    "megapixels": round(megapixels, 3),
+                    "wall_s": wall,
+                    "wall_min_s": wall_min,
+                    "mpix_per_s": megapixels / wall if wall > 0 else float("inf"),
+                    "peak_mb": peak / 2**20,
+                }
+                results.append(row)
+                print(
+                    f"  {size:>4} {source:<10} {module:<8} {entry:<26} "
+                    f"{wall * 1000:9.1f} ms {row['mpix_per_s']:8.2f} MP/s "
+                    f"{row['peak_mb']:8.1f} MB"
+                )
+            del img
+    return results
+
+
+def environment_info():
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "skimage": skimage.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "precision": precision.float_dtype().name,
+        "backend": backends.get_mode(),
+    }
+
+
+def save_results(filepath, results, info):
+    """Hasil ke JSON (dengan info lingkungan) dan CSV dengan nama yang sama."""
+    filepath = Path(filepath)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    filepath.write_text(json.dumps({"environment": info, "results": results}, indent=1))
+    utils.save_params_to_csv(filepath.with_suffix(".csv"), results)
+
+
+def load_results(filepath):
+    return json.loads(Path(filepath).read_text())["results"]
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Bandingkan dengan baseline per (modul, entri, sumber, ukuran).
+    Mengembalikan list regresi: wall time minimum (paling tahan noise) atau
+    peak memori naik lebih dari threshold (relatif). Entri yang tidak ada
+    di baseline dilewati.
+    """
+    base = {tuple(row[k] for k in RESULT_KEYS): row for row in baseline}
+    regressions = []
+    for row in results:
+        ref = base.get(tuple(row[k] for k in RESULT_KEYS))
+        if ref is None:
+            continue
+        for metric in ("wall_min_s", "peak_mb"):
+            old, new = ref[metric], row[metric]
+            if metric == "wall_min_s" and max(old, new) < MIN_COMPARE_SECONDS:
+                continue
+            if old > 0 and new > old * (1 + threshold):
+                regressions.append({
+                    **{k: row[k] for k in RESULT_KEYS},
+                    "metric": metric,
+                    "baseline": old,
+                    "current": new,
+                    "ratio": new / old,
+                })
+    return regressions
+
+
+def _split(value):
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark semua entri config")
+    parser.add_argument(
+        "--sizes", default=",".join(DEFAULT_SIZES),
+        help=f"Resolusi, dipisah koma ({', '.join(SIZES)}) atau 'all'."
+    )
+    parser.add_argument(
+        "--sources", default=",".join(DEFAULT_SOURCES),
+        help="Sumber gambar: 'synthetic' dan/atau nama gambar di utils.load_images."
+    )
+    parser.add_argument(
+        "--modules", default=",".join(MODULES),
+        help=f"Modul yang dijalankan ({', '.join(MODULES)})."
+    )
+    parser.add_argument("--entries", default=None, help="Substring nama entri, dipisah koma.")
+    parser.add_argument("--repeat", type=int, default=3, help="Jumlah pengulangan per entri.")
+    parser.add_argument(
+        "--output", default="benchmark_results.json",
+        help="File JSON hasil (CSV ditulis di sampingnya)."
+    )
+    parser.add_argument("--compare", default=None, help="JSON baseline untuk deteksi regresi.")
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help="Kenaikan relatif yang dianggap regresi (default 0.15 = 15%%)."
+    )
+    parser.add_argument(
+        "--median-radii", default=None, metavar="R1,R2,...",
+        help="Hanya cek waktu median per radius (ukuran pertama --sizes); "
+             f"gagal jika naik > {MEDIAN_FLAT_LIMIT:g}x dari radius pertama."
+    )
+    parser.add_argument(
+        "--pyramid-check", type=int, default=None, metavar="LEVELS",
+        help="Hanya bandingkan Harris --pyramid LEVELS dengan corner_peaks (ukuran pertama "
+             "--sizes, setiap --sources); gagal jika ada peak yang tidak ada di hasil penuh."
+    )
+    parser.add_argument(
+        "--knn-check", type=int, default=None, metavar="N",
+        help="Hanya bandingkan GridIndex.query_knn/query_radius dengan brute force pada N titik "
+             "acak (termasuk query di luar bounding box); gagal jika ada yang berbeda."
+    )
+    parser.add_argument(
+        "--remap-frames", type=int, default=None, metavar="N",
+        help="Hanya bandingkan remap.warp_stack N frame dengan loop transform.warp (ukuran "
+             "pertama --sizes); gagal jika warp_stack (termasuk membangun tabel) tidak lebih "
+             f"cepat atau selisihnya > {REMAP_MAX_DIFF:.4g}."
+    )
+    precision.add_precision_args(parser)
+    backends.add_backend_args(parser)
+    args = parser.parse_args()
+    precision.set_from_args(args)
+    backends.set_from_args(args)
+
+    sizes = list(SIZES) if args.sizes == "all" else _split(args.sizes)
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"ukuran tidak dikenal: {', '.join(unknown)}")
+    modules = _split(args.modules)
+    unknown = [m for m in modules if m not in MODULES]
+    if unknown:
+        parser.error(f"modul tidak dikenal: {', '.join(unknown)}")
+
+    if args.median_radii:
+        print("--- Median per radius ---")
+        radii = [int(r) for r in _split(args.median_radii)]
+        results = median_radius_sweep(radii, sizes[0], args.repeat)
+        utils.save_params_to_csv(Path(args.output).with_suffix(".csv"), results)
+        worst = max(results, key=lambda row: row["ratio"])
+        if worst["ratio"] > MEDIAN_FLAT_LIMIT:
+            print(f"\nMedian {worst['shape']} r={worst['radius']}: x{worst['ratio']:.2f} "
+                  f"(> {MEDIAN_FLAT_LIMIT:g}x)")
+            sys.exit(1)
+        return
+
+    if args.pyramid_check is not None:
+        sources = _split(args.sources)
+        sample_images = utils.load_images() if any(s != "synthetic" for s in sources) else {}
+        extra = 0
+        for source in sources:
+            print(f"--- Harris pyramid {args.pyramid_check} vs corner_peaks: {source} {sizes[0]} ---")
+            rows = pyramid_harris_check(load_source(source, sizes[0], sample_images), args.pyramid_check)
+            extra += sum(row["extra"] for row in rows)
+        if extra:
+            print(f"\n{extra} peak pyramid tidak ada di hasil corner_peaks")
+            sys.exit(1)
+        return
+
+    if args.knn_check is not None:
+        print(f"--- GridIndex vs brute force: {args.knn_check} titik ---")
+        rows = grid_knn_check(args.knn_check)
+        utils.save_params_to_csv(Path(args.output).with_suffix(".csv"), rows)
+        if any(row["bad_knn"] or row["bad_radius"] for row in rows):
+            sys.exit(1)
+        return
+
+    if args.remap_frames is not None:
+        print(f"--- remap.warp_stack vs transform.warp: {args.remap_frames} frame ---")
+        row = remap_stack_check(args.remap_frames, sizes[0], args.repeat)
+        utils.save_params_to_csv(Path(args.output).with_suffix(".csv"), [row])
+        if row["warp_stack_cold_s"] >= row["warp_loop_s"] or row["max_abs_diff"] > REMAP_MAX_DIFF:
+            sys.exit(1)
+        return
+
+    print("--- Benchmark ---")
+    results = run_benchmarks(
+        sizes=sizes, sources=_split(args.sources), modules=modules,
+        entries=_split(args.entries) if args.entries else None, repeat=args.repeat,
+    )
+    save_results(args.output, results, environment_info())
+
+    if args.compare:
+        regressions = compare(results, load_results(args.compare), args.threshold)
+        if not regressions:
+            print(f"\nTidak ada regresi (> {args.threshold:.0%}) terhadap {args.compare}")
+            return
+        print(f"\n{len(regressions)} regresi terhadap {args.compare}:")
+        for r in regressions:
+            print(
+                f"  {r['size']:>4} {r['source']:<10} {r['module']:<8} {r['entry']:<26} "
+                f"{r['metric']}: {r['baseline']:.4g} -> {r['current']:.4g} (x{r['ratio']:.2f})"
+            )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
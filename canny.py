@@ -0,0 +1,169 @@
+# Nama: Kayla Namira Mariadi
+# NIM: 13522050
+# Deskripsi: Canny (setara skimage.feature.canny) yang mengambil tahap
+#            smoothing Gaussian dari cache scale-space.
+
+import numpy as np
+from scipy import ndimage as ndi
+from skimage import feature
+from skimage.util import dtype_limits
+
+import backends
+import scalespace
+
+try:
+    # NMS bilinear internal skimage (bukan API publik, bisa berubah antar
+    # versi). Jika tidak ada, canny/canny_multi jatuh ke feature.canny.
+    from skimage.feature._canny_cy import _nonmaximum_suppression_bilinear
+except ImportError:
+    _nonmaximum_suppression_bilinear = None
+
+
+def _supported_float_type(dtype):
+    """Tipe float kerja skimage: float16/float32 -> float32, lainnya float64."""
+    return np.float32 if np.dtype(dtype) in (np.float16, np.float32) else np.float64
+
+
+def smooth(image, sigma, mode="constant", cval=0.0):
+    """
+    Tahap preprocessing Canny tanpa mask: blur Gaussian lalu koreksi
+    bleed-over di tepi (sama seperti _preprocess milik skimage).
+    Blur gambar dan blur mask diambil dari scalespace.CACHE.
+    """
+    gaussian_kwargs = dict(mode=mode, cval=cval, preserve_range=False)
+    smoothed = scalespace.gaussian(
+        image, sigma=sigma, operation=backends.canny_gaussian, **gaussian_kwargs
+    )
+
+    eroded_mask = np.ones(image.shape, dtype=bool)
+    eroded_mask[:1, :] = 0
+    eroded_mask[-1:, :] = 0
+    eroded_mask[:, :1] = 0
+    eroded_mask[:, -1:] = 0
+
+    if mode == "constant":
+        float_type = _supported_float_type(image.dtype)
+        ones_key = (
+            "ones", image.shape, np.dtype(float_type).str,
+            tuple(np.ravel(sigma).tolist()), mode, cval,
+        )
+        bleed_over = scalespace.CACHE.get_or_compute(
+            ones_key,
+            lambda: backends.canny_gaussian(
+                np.ones(image.shape, dtype=float_type), sigma=sigma, **gaussian_kwargs
+            ) + np.finfo(float_type).eps,
+        )
+        smoothed = smoothed / bleed_over
+
+    return smoothed, eroded_mask
+
+
+def _normalize_thresholds(image, low_threshold, high_threshold, use_quantiles):
+    """Default & skala threshold sama seperti feature.canny."""
+    dtype_max = dtype_limits(image, clip_negative=False)[1]
+    if low_threshold is None:
+        low_threshold = 0.1
+    elif use_quantiles:
+        if not (0.0 <= low_threshold <= 1.0):
+            raise ValueError("Quantile thresholds must be between 0 and 1.")
+    else:
+        low_threshold /= dtype_max
+    if high_threshold is None:
+        high_threshold = 0.2
+    elif use_quantiles:
+        if not (0.0 <= high_threshold <= 1.0):
+            raise ValueError("Quantile thresholds must be between 0 and 1.")
+    else:
+        high_threshold /= dtype_max
+    if high_threshold < low_threshold:
+        raise ValueError("low_threshold should be lower then high_threshold")
+    return low_threshold, high_threshold
+
+
+def _check_image(image):
+    if image.ndim != 2:
+        raise ValueError("canny hanya menerima gambar 2D (grayscale)")
+    if np.issubdtype(image.dtype, np.int64) or np.issubdtype(image.dtype, np.uint64):
+        raise ValueError("64-bit integer images are not supported")
+
+
+def _gradient_magnitude(image, sigma, mode, cval):
+    """Smoothing (dari cache) + gradien Sobel + magnitude."""
+    smoothed, eroded_mask = smooth(image, sigma, mode=mode, cval=cval)
+    jsobel = ndi.sobel(smoothed, axis=1)
+    isobel = ndi.sobel(smoothed, axis=0)
+    magnitude = isobel * isobel
+    magnitude += jsobel * jsobel
+    np.sqrt(magnitude, out=magnitude)
+    return isobel, jsobel, magnitude, eroded_mask
+
+
+def canny(image, sigma=1.0, low_threshold=None, high_threshold=None,
+          mask=None, use_quantiles=False, *, mode="constant", cval=0.0):
+    """
+    Pengganti feature.canny dengan hasil yang identik. Jika mask diberikan
+    (atau NMS internal skimage tidak tersedia), langsung diteruskan ke
+    feature.canny (smoothing tidak di-cache).
+    """
+    if mask is not None or _nonmaximum_suppression_bilinear is None:
+        return feature.canny(image, sigma, low_threshold, high_threshold, mask,
+                             use_quantiles, mode=mode, cval=cval)
+
+    return canny_multi(image, sigma, [(low_threshold, high_threshold)],
+                       use_quantiles=use_quantiles, mode=mode, cval=cval)[0]
+
+
+def canny_multi(image, sigma=1.0, thresholds=((None, None),),
+                use_quantiles=False, *, mode="constant", cval=0.0):
+    """
+    Canny untuk banyak pasangan (low_threshold, high_threshold) dengan satu
+    sigma. Smoothing, gradien, dan non-maximum suppression dihitung sekali
+    (NMS memakai low threshold terkecil); per pasangan hanya tahap
+    hysteresis yang dijalankan. Mengembalikan list edge map boolean dengan
+    urutan sama seperti thresholds; tiap hasil identik dengan feature.canny.
+    Tanpa NMS internal skimage, setiap pasangan dihitung dengan feature.canny.
+    """
+    if _nonmaximum_suppression_bilinear is None:
+        return [
+            feature.canny(image, sigma, low, high, None, use_quantiles, mode=mode, cval=cval)
+            for low, high in thresholds
+        ]
+
+    _check_image(image)
+    pairs = [
+        _normalize_thresholds(image, low, high, use_quantiles)
+        for low, high in thresholds
+    ]
+    if not pairs:
+        return []
+
+    isobel, jsobel, magnitude, eroded_mask = _gradient_magnitude(image, sigma, mode, cval)
+
+    if use_quantiles:
+        quantiles = np.array(pairs, dtype=float).ravel() * 100.0
+        pairs = np.percentile(magnitude, quantiles).reshape(-1, 2).tolist()
+
+    # NMS tidak bergantung pada threshold kecuali pemotongan magnitude < low,
+    # jadi cukup dihitung sekali dengan low terkecil lalu dipotong per pasangan
+    min_low = min(low for low, _ in pairs)
+    low_masked = _nonmaximum_suppression_bilinear(
+        isobel, jsobel, magnitude, eroded_mask, min_low
+    )
+
+    return [_hysteresis(low_masked, low, high) for low, high in pairs]
+
+
+def _hysteresis(low_masked, low_threshold, high_threshold):
+    """Double threshold + edge tracking (komponen 8-connected)."""
+    low_mask = low_masked > 0
+    low_mask &= low_masked >= low_threshold
+    strel = np.ones((3, 3), bool)
+    labels, count = ndi.label(low_mask, strel)
+    if count == 0:
+        return low_mask
+
+    high_mask = low_mask & (low_masked >= high_threshold)
+    nonzero_sums = np.unique(labels[high_mask])
+    good_label = np.zeros((count + 1,), bool)
+    good_label[nonzero_sums] = True
+    return good_label[labels]
@@ -0,0 +1,172 @@
+# Nama: Kayla Namira Mariadi
+# NIM: 13522050
+# Deskripsi: Response Harris yang di-cache per (gambar, k) dan ekstraktor
+#            peak yang menjawab banyak query (min_distance, threshold_rel)
+#            dari satu daftar kandidat terurut.
+
+import numpy as np
+from scipy import ndimage as ndi
+from scipy import spatial
+
+import backends
+import scalespace
+
+
+def harris_response(image, k=0.05, **kwargs):
+    """
+    feature.corner_harris (lewat backends.harris) yang hasilnya disimpan di
+    scalespace.CACHE, di-key dengan isi gambar, k, dan argumen lain
+    (method, eps, sigma).
+    """
+    key = (
+        "harris", scalespace.fingerprint(image), float(k),
+        tuple(sorted(kwargs.items())),
+    )
+    return scalespace.CACHE.get_or_compute(
+        key, lambda: backends.harris(image, k=k, **kwargs)
+    )
+
+
+class PeakExtractor:
+    """
+    Menyimpan semua maksimum lokal 3x3 dari sebuah response map, terurut
+    dari response tertinggi. Setiap query(min_distance, threshold_rel)
+    menghasilkan koordinat yang sama persis dengan feature.corner_peaks
+    (exclude_border=True, p_norm=inf), tanpa menghitung ulang response.
+
+    Maksimum pada jendela (2d+1) selalu juga maksimum pada jendela 3x3,
+    sehingga hasil setiap query adalah subset dari daftar kandidat ini.
+    """
+
+    def __init__(self, response):
+        self.response = response
+        self.min_value = response.min()
+        self.max_value = response.max()
+        # Maximum filter per min_distance, dihitung sekali per nilai d
+        self._max_filtered = {}
+
+        mask = self._peak_mask(1)
+        coords = np.argwhere(mask)
+        values = response[mask]
+        # Urutan sama dengan skimage: response menurun, seri -> row-major
+        order = np.argsort(-values, kind="stable")
+        self.coords = coords[order]
+        self.values = values[order]
+
+    def _peak_mask(self, min_distance):
+        size = 2 * min_distance + 1
+        image_max = ndi.maximum_filter(self.response, size=size, mode="nearest")
+        is_peak = self.response == image_max
+        if np.all(is_peak):
+            # Tidak ada peak untuk gambar yang rata
+            is_peak[:] = False
+        self._max_filtered[min_distance] = (image_max, not is_peak.any())
+        return is_peak
+
+    def query(self, min_distance=1, threshold_rel=None):
+        """Koordinat (row, col) peak untuk satu kombinasi parameter."""
+        d = int(min_distance)
+        threshold = self.min_value
+        if threshold_rel is not None:
+            threshold = max(threshold, threshold_rel * self.max_value)
+
+        # values terurut menurun -> kandidat di atas threshold adalah prefix
+        n = np.searchsorted(-self.values, -threshold, side="left")
+        coords, values = self.coords[:n], self.values[:n]
+
+        if d > 1:
+            if d not in self._max_filtered:
+                self._peak_mask(d)
+            image_max, trivial = self._max_filtered[d]
+            if trivial:
+                return np.empty((0, 2), dtype=np.intp)
+            keep = values == image_max[coords[:, 0], coords[:, 1]]
+            coords = coords[keep]
+
+        return coords[_exclude_and_space(coords, self.response.shape, d)]
+
+    def query_many(self, queries):
+        """queries: iterable (min_distance, threshold_rel) -> list koordinat."""
+        return [self.query(d, rel) for d, rel in queries]
+
+
+def _exclude_and_space(coords, shape, d):
+    """
+    Tahap akhir corner_peaks untuk kandidat terurut response menurun.
+    Mengembalikan indeks kandidat yang lolos (urutan dipertahankan).
+    """
+    # exclude_border=True -> lebar border = min_distance
+    h, w = shape
+    inside = (
+        (coords[:, 0] >= d) & (coords[:, 0] < h - d)
+        & (coords[:, 1] >= d) & (coords[:, 1] < w - d)
+    )
+    index = np.flatnonzero(inside)
+    # Dua tahap seperti skimage: peak_local_max menolak jarak < d,
+    # lalu corner_peaks menolak jarak <= d pada sisa peak
+    if d > 1:
+        index = index[_spacing_mask(coords[index], d - 1)]
+    return index[_spacing_mask(coords[index], d)]
+
+
+def local_peaks(response, min_distance=1):
+    """
+    Maksimum lokal pada jendela (2d+1) (border 'nearest') tanpa threshold
+    dan spacing, beserta response-nya. Dipakai per jendela oleh mode
+    pyramid; seleksi akhir lewat select_peaks.
+    """
+    size = 2 * int(min_distance) + 1
+    is_peak = response == ndi.maximum_filter(response, size=size, mode="nearest")
+    if np.all(is_peak):
+        return np.empty((0, 2), dtype=np.intp), response[:0, 0]
+    coords = np.argwhere(is_peak)
+    return coords, response[is_peak]
+
+
+def select_peaks(coords, values, shape, min_distance, threshold):
+    """
+    Seleksi corner_peaks (threshold absolut, exclude border, spacing) untuk
+    peak hasil local_peaks yang digabung dari beberapa jendela gambar
+    berukuran shape. Mengembalikan (coords, values) terurut menurun.
+    """
+    # Urutan seperti PeakExtractor: response menurun, seri -> row-major
+    order = np.lexsort((coords[:, 1], coords[:, 0], -values))
+    coords, values = coords[order], values[order]
+    above = values > threshold
+    coords, values = coords[above], values[above]
+
+    kept = _exclude_and_space(coords, shape, int(min_distance))
+    return coords[kept], values[kept]
+
+
+def _spacing_mask(coords, min_distance):
+    """
+    Seleksi greedy (urutan response): peak yang berjarak Chebyshev
+    <= min_distance dari peak yang sudah diterima dibuang. Mengembalikan
+    mask peak yang dipertahankan.
+    """
+    if len(coords) == 0:
+        return np.ones(0, dtype=bool)
+    tree = spatial.cKDTree(coords)
+    neighbours = tree.query_ball_point(coords, r=min_distance, p=np.inf)
+    rejected = np.zeros(len(coords), dtype=bool)
+    for idx, candidates in enumerate(neighbours):
+        if rejected[idx]:
+            continue
+        rejected[candidates] = True
+        rejected[idx] = False
+    return ~rejected
+
+
+def harris_multi(image, k=0.05, queries=((1, None),), **kwargs):
+    """
+    Deteksi Harris untuk banyak (min_distance, threshold_rel) sekaligus.
+    Response dihitung (atau diambil dari cache) sekali.
+    Mengembalikan list (coords, responses_at_coords) sesuai urutan queries.
+    """
+    response = harris_response(image, k=k, **kwargs)
+    extractor = PeakExtractor(response)
+    results = []
+    for coords in extractor.query_many(queries):
+        results.append((coords, response[coords[:, 0], coords[:, 1]]))
+    return results
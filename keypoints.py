@@ -0,0 +1,207 @@
+# Nama: Kayla Namira Mariadi
+# NIM: 13522050
+# Deskripsi: Penyimpanan keypoint berbasis array (posisi, response, skala,
+#            orientasi), indeks grid seragam untuk query radius / k-nearest,
+#            dan adaptive non-maximal suppression (ANMS).
+
+import operator
+
+import cv2
+import numpy as np
+from scipy import spatial
+
+
+class KeypointSet:
+    """
+    Kumpulan keypoint sebagai array paralel (tanpa objek per keypoint):
+    coords (N, 2) float64 (baris, kolom), responses, scales (diameter
+    piksel), dan orientations (derajat, -1 jika tidak ada), masing-masing
+    float32 (N,).
+    """
+
+    def __init__(self, coords, responses=None, scales=None, orientations=None):
+        self.coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        n = len(self.coords)
+        self.responses = _column(responses, n, 0.0)
+        self.scales = _column(scales, n, 1.0)
+        self.orientations = _column(orientations, n, -1.0)
+
+    @classmethod
+    def from_cv2(cls, keypoints):
+        """
+        Dari tuple cv2.KeyPoint hasil detect(). Posisi diambil sekaligus
+        lewat cv2.KeyPoint_convert; atribut lain diisi langsung ke array
+        float32 dengan np.fromiter (tanpa list perantara).
+        """
+        n = len(keypoints)
+        if n == 0:
+            return cls(np.empty((0, 2)))
+        coords_xy = cv2.KeyPoint_convert(keypoints).reshape(-1, 2)
+
+        def attribute(name):
+            return np.fromiter(map(operator.attrgetter(name), keypoints), dtype=np.float32, count=n)
+
+        return cls(
+            coords_xy[:, ::-1], attribute("response"), attribute("size"), attribute("angle")
+        )
+
+    def __len__(self):
+        return len(self.coords)
+
+    def __getitem__(self, index):
+        """Subset (indeks, slice, atau mask bool) sebagai KeypointSet baru."""
+        return KeypointSet(
+            self.coords[index], self.responses[index],
+            self.scales[index], self.orientations[index],
+        )
+
+    def as_arrays(self):
+        """(coords, responses float64), format yang dipakai runner."""
+        return self.coords, self.responses.astype(np.float64)
+
+    def strongest(self, n):
+        """n keypoint dengan response terbesar (urut menurun)."""
+        n = min(n, len(self))
+        top = np.argpartition(-self.responses, n - 1)[:n] if 0 < n < len(self) else np.arange(len(self))
+        return self[top[np.argsort(-self.responses[top], kind="stable")]]
+
+    def grid(self, cell_size=None):
+        return GridIndex(self.coords, cell_size)
+
+    def anms(self, n, robust=0.9):
+        """n keypoint yang tersebar merata, lihat anms()."""
+        return self[anms(self.coords, self.responses, n, robust)]
+
+
+def _column(values, n, default):
+    if values is None:
+        return np.full(n, default, dtype=np.float32)
+    return np.asarray(values, dtype=np.float32).reshape(n)
+
+
+class GridIndex:
+    """
+    Indeks grid seragam: titik diurutkan per sel (counting sort), sehingga
+    isi setiap sel adalah satu slice berurutan. Query radius hanya
+    memeriksa sel yang bersinggungan dengan lingkaran query.
+    cell_size default dipilih agar rata-rata ~4 titik per sel.
+    """
+
+    def __init__(self, coords, cell_size=None):
+        self.coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        n = len(self.coords)
+        if n:
+            self.origin = self.coords.min(axis=0)
+            extent = self.coords.max(axis=0) - self.origin
+        else:
+            self.origin = np.zeros(2)
+            extent = np.zeros(2)
+        if cell_size is None:
+            cell_size = np.sqrt(max(extent[0] * extent[1], 1.0) * 4 / max(n, 1))
+        self.cell_size = max(float(cell_size), 1e-6)
+        self.shape = tuple((extent // self.cell_size).astype(int) + 1)
+
+        cells = self._cell_ids(self.coords)
+        self.order = np.argsort(cells, kind="stable")
+        counts = np.bincount(cells, minlength=self.shape[0] * self.shape[1])
+        self.starts = np.concatenate(([0], np.cumsum(counts)))
+
+    def _cell_ids(self, coords):
+        cell = ((coords - self.origin) // self.cell_size).astype(np.intp)
+        return cell[:, 0] * self.shape[1] + cell[:, 1]
+
+    def _cells_in_box(self, point, radius):
+        """Indeks titik di semua sel yang beririsan dengan kotak point +- radius."""
+        low = np.floor((point - radius - self.origin) / self.cell_size).astype(int)
+        high = np.floor((point + radius - self.origin) / self.cell_size).astype(int)
+        low = np.maximum(low, 0)
+        high = np.minimum(high, np.array(self.shape) - 1)
+        if np.any(high < low):
+            return np.empty(0, dtype=np.intp)
+
+        rows = np.arange(low[0], high[0] + 1)
+        # Sel dalam satu baris grid berurutan, jadi cukup satu slice per baris
+        first = rows * self.shape[1] + low[1]
+        begin = self.starts[first]
+        end = self.starts[first + (high[1] - low[1]) + 1]
+        return np.concatenate([self.order[b:e] for b, e in zip(begin, end)])
+
+    def query_radius(self, point, radius):
+        """Indeks titik dengan jarak <= radius dari point (baris, kolom), urut jarak."""
+        point = np.asarray(point, dtype=np.float64)
+        candidates = self._cells_in_box(point, radius)
+        dist = np.hypot(*(self.coords[candidates] - point).T)
+        inside = dist <= radius
+        candidates, dist = candidates[inside], dist[inside]
+        return candidates[np.argsort(dist, kind="stable")]
+
+    def query_knn(self, point, k):
+        """
+        Indeks min(k, N) titik terdekat dari point, urut jarak. Kotak query
+        diperbesar sampai berisi >= k kandidat (point boleh di luar grid);
+        jarak kandidat ke-k lalu dipakai sebagai radius agar hasilnya exact.
+        """
+        point = np.asarray(point, dtype=np.float64)
+        if not np.all(np.isfinite(point)):
+            raise ValueError("point harus berhingga")
+        k = min(k, len(self.coords))
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+        # Kotak setengah-sisi ini mencakup seluruh grid dari point
+        reach = np.max(np.abs(point - self.origin)) + self.cell_size * max(self.shape)
+        half = self.cell_size
+        while True:
+            candidates = self._cells_in_box(point, half)
+            if len(candidates) >= k:
+                break
+            if half >= reach:
+                candidates = np.arange(len(self.coords))
+                break
+            half *= 2
+        dist = np.hypot(*(self.coords[candidates] - point).T)
+        radius = np.partition(dist, k - 1)[k - 1]
+        return self.query_radius(point, radius)[:k]
+
+
+def suppression_radii(coords, responses, robust=0.9, k=16):
+    """
+    Radius ANMS (Brown dkk.) setiap titik: jarak ke titik terdekat j dengan
+    responses[i] < robust * responses[j]; inf untuk titik terkuat.
+    Dihitung dari k tetangga terdekat (cKDTree, sekaligus untuk semua
+    titik); hanya titik yang belum menemukan penekan yang di-query ulang
+    dengan k dua kali lipat. Total O(N k log N), bukan O(N^2).
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    responses = np.asarray(responses, dtype=np.float64)
+    n = len(coords)
+    radii = np.full(n, np.inf)
+    if n < 2:
+        return radii
+
+    tree = spatial.cKDTree(coords)
+    pending = np.arange(n)
+    # Titik tanpa penekan sama sekali (mis. yang terkuat) tidak perlu dicari
+    pending = pending[responses[pending] < robust * responses.max()]
+    while len(pending):
+        k = min(k, n)
+        dist, idx = tree.query(coords[pending], k=k)
+        dist, idx = dist.reshape(len(pending), k), idx.reshape(len(pending), k)
+        stronger = (responses[pending, None] < robust * responses[idx]) & (idx != pending[:, None])
+        found = stronger.any(axis=1)
+        first = stronger.argmax(axis=1)
+        radii[pending[found]] = dist[found, first[found]]
+        if k == n:
+            break
+        pending = pending[~found]
+        k *= 2
+    return radii
+
+
+def anms(coords, responses, n, robust=0.9):
+    """
+    Indeks n titik dengan radius supresi terbesar (keypoint kuat yang
+    tersebar merata), urut radius menurun; seri diputus oleh response.
+    """
+    radii = suppression_radii(coords, responses, robust)
+    order = np.lexsort((-np.asarray(responses, dtype=np.float64), -radii))
+    return order[:n]
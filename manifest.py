@@ -0,0 +1,143 @@
+# Nama: Kayla Namira Mariadi
+# NIM: 13522050
+# Deskripsi: Manifest berbasis hash konten untuk re-run inkremental.
+#            Output yang input, config, dan versi kodenya tidak berubah
+#            tidak dihitung ulang.
+
+import functools
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+import backends
+import precision
+import scalespace
+import utils
+
+MANIFEST_NAME = "manifest.json"
+
+
+def _canonical(obj):
+    """Representasi stabil (bisa di-hash) untuk isi entri config."""
+    if isinstance(obj, dict):
+        return {str(k): _canonical(v) for k, v in sorted(obj.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        digest = hashlib.sha256(np.ascontiguousarray(obj).tobytes()).hexdigest()
+        return ["ndarray", obj.dtype.str, list(obj.shape), digest]
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if callable(obj):
+        return f"{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', repr(obj))}"
+    if isinstance(obj, (str, int, float, bool)) or obj is None:
+        return obj
+    return repr(obj)
+
+
+def stable_hash(*parts):
+    payload = json.dumps(_canonical(list(parts)), sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def code_version(runner_file):
+    """
+    Hash dari source runner + semua modul helper di root proyek (utils.py,
+    scalespace.py, ...). Perubahan kode mana pun membuat output dihitung ulang.
+    """
+    runner_file = Path(runner_file).resolve()
+    root_dir = Path(__file__).resolve().parent
+    h = hashlib.sha256()
+    for path in [runner_file] + sorted(root_dir.glob("*.py")):
+        h.update(path.name.encode())
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def _jsonable_log(log_entry):
+    """Nilai log dibuat JSON-safe dengan bentuk teks yang sama seperti di CSV."""
+    out = {}
+    for k, v in log_entry.items():
+        if isinstance(v, np.ndarray):
+            v = str(v)
+        elif isinstance(v, np.generic):
+            v = v.item()
+        out[k] = v
+    return out
+
+
+class Manifest:
+    """
+    Manifest per direktori output: {key: {fingerprint, outputs, log}}.
+    fingerprint = hash(gambar input, entri config, versi kode).
+    Dengan enabled=False semua entri dianggap basi dan tidak ada yang ditulis,
+    sehingga runner bisa memakai kode yang sama untuk mode normal.
+    """
+
+    def __init__(self, output_dir, code_version, image_hash, enabled=True):
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / MANIFEST_NAME
+        self.code_version = code_version
+        self.image_hash = image_hash
+        self.enabled = enabled
+        self.entries = {}
+        if enabled and self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                # Manifest rusak -> anggap semua output perlu dihitung ulang
+                self.entries = {}
+
+    def fingerprint(self, config):
+        return stable_hash(self.image_hash, config, self.code_version)
+
+    def is_fresh(self, key, config, outputs=()):
+        """
+        True jika fingerprint sama dan semua file output masih ada, termasuk
+        outputs (path yang diminta run ini, mis. PNG dan file results store).
+        """
+        if not self.enabled:
+            return False
+        entry = self.entries.get(key)
+        if entry is None or entry.get("fingerprint") != self.fingerprint(config):
+            return False
+        recorded = [self.output_dir / name for name in entry.get("outputs", [])]
+        return all(Path(path).exists() for path in [*recorded, *outputs])
+
+    def log(self, key):
+        return dict(self.entries[key].get("log") or {})
+
+    def record(self, key, config, outputs, log_entry=None):
+        if not self.enabled:
+            return
+        self.entries[key] = {
+            "fingerprint": self.fingerprint(config),
+            "outputs": [os.path.relpath(p, self.output_dir) for p in outputs],
+            "log": _jsonable_log(log_entry) if log_entry is not None else None,
+        }
+
+    def save(self):
+        if not self.enabled:
+            return
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{MANIFEST_NAME}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(self.entries, indent=1))
+        os.replace(tmp_path, self.path)
+
+
+def for_image(output_dir, img, runner_file, enabled=True):
+    """Manifest untuk satu direktori output gambar (hash hanya dihitung jika aktif)."""
+    if not enabled:
+        return Manifest(output_dir, None, None, enabled=False)
+    # Output mode float32 berbeda tipis dari float64, jadi presisi ikut versi;
+    # begitu juga backend per operasi (OpenCV bisa beda 1 level abu-abu) dan
+    # opsi writer (kompresi, gray -> RGB) yang mengubah file PNG-nya
+    version = stable_hash(
+        code_version(runner_file), precision.float_dtype().name,
+        backends.get_mode(), backends.resolved(), utils.writer_options(),
+    )
+    return Manifest(output_dir, version, scalespace.fingerprint(img))
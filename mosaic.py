@@ -0,0 +1,162 @@
+# Nama: Kayla Namira Mariadi
+# NIM: 13522050
+# Deskripsi: Kompositor mosaic (grid gambar + label) berbasis NumPy, tanpa
+#            matplotlib, untuk comparison plot yang cepat.
+
+import numpy as np
+
+# Font bitmap 5x7: tiap glyph 7 baris, tiap baris 5 bit (MSB = kolom kiri).
+# Huruf kecil digambar sebagai huruf kapital.
+_FONT_5X7 = {
+    "A": (0x0E, 0x11, 0x11, 0x11, 0x1F, 0x11, 0x11),
+    "B": (0x1E, 0x11, 0x11, 0x1E, 0x11, 0x11, 0x1E),
+    "C": (0x0E, 0x11, 0x10, 0x10, 0x10, 0x11, 0x0E),
+    "D": (0x1C, 0x12, 0x11, 0x11, 0x11, 0x12, 0x1C),
+    "E": (0x1F, 0x10, 0x10, 0x1E, 0x10, 0x10, 0x1F),
+    "F": (0x1F, 0x10, 0x10, 0x1E, 0x10, 0x10, 0x10),
+    "G": (0x0E, 0x11, 0x10, 0x17, 0x11, 0x11, 0x0F),
+    "H": (0x11, 0x11, 0x11, 0x1F, 0x11, 0x11, 0x11),
+    "I": (0x0E, 0x04, 0x04, 0x04, 0x04, 0x04, 0x0E),
+    "J": (0x07, 0x02, 0x02, 0x02, 0x02, 0x12, 0x0C),
+    "K": (0x11, 0x12, 0x14, 0x18, 0x14, 0x12, 0x11),
+    "L": (0x10, 0x10, 0x10, 0x10, 0x10, 0x10, 0x1F),
+    "M": (0x11, 0x1B, 0x15, 0x15, 0x11, 0x11, 0x11),
+    "N": (0x11, 0x11, 0x19, 0x15, 0x13, 0x11, 0x11),
+    "O": (0x0E, 0x11, 0x11, 0x11, 0x11, 0x11, 0x0E),
+    "P": (0x1E, 0x11, 0x11, 0x1E, 0x10, 0x10, 0x10),
+    "Q": (0x0E, 0x11, 0x11, 0x11, 0x15, 0x12, 0x0D),
+    "R": (0x1E, 0x11, 0x11, 0x1E, 0x14, 0x12, 0x11),
+    "S": (0x0F, 0x10, 0x10, 0x0E, 0x01, 0x01, 0x1E),
+    "T": (0x1F, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04),
+    "U": (0x11, 0x11, 0x11, 0x11, 0x11, 0x11, 0x0E),
+    "V": (0x11, 0x11, 0x11, 0x11, 0x11, 0x0A, 0x04),
+    "W": (0x11, 0x11, 0x11, 0x15, 0x15, 0x15, 0x0A),
+    "X": (0x11, 0x11, 0x0A, 0x04, 0x0A, 0x11, 0x11),
+    "Y": (0x11, 0x11, 0x11, 0x0A, 0x04, 0x04, 0x04),
+    "Z": (0x1F, 0x01, 0x02, 0x04, 0x08, 0x10, 0x1F),
+    "0": (0x0E, 0x11, 0x13, 0x15, 0x19, 0x11, 0x0E),
+    "1": (0x04, 0x0C, 0x04, 0x04, 0x04, 0x04, 0x0E),
+    "2": (0x0E, 0x11, 0x01, 0x02, 0x04, 0x08, 0x1F),
+    "3": (0x1F, 0x02, 0x04, 0x02, 0x01, 0x11, 0x0E),
+    "4": (0x02, 0x06, 0x0A, 0x12, 0x1F, 0x02, 0x02),
+    "5": (0x1F, 0x10, 0x1E, 0x01, 0x01, 0x11, 0x0E),
+    "6": (0x06, 0x08, 0x10, 0x1E, 0x11, 0x11, 0x0E),
+    "7": (0x1F, 0x01, 0x02, 0x04, 0x08, 0x08, 0x08),
+    "8": (0x0E, 0x11, 0x11, 0x0E, 0x11, 0x11, 0x0E),
+    "9": (0x0E, 0x11, 0x11, 0x0F, 0x01, 0x02, 0x0C),
+    " ": (0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00),
+    ".": (0x00, 0x00, 0x00, 0x00, 0x00, 0x0C, 0x0C),
+    ",": (0x00, 0x00, 0x00, 0x00, 0x0C, 0x04, 0x08),
+    "_": (0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x1F),
+    "-": (0x00, 0x00, 0x00, 0x1F, 0x00, 0x00, 0x00),
+    "(": (0x02, 0x04, 0x08, 0x08, 0x08, 0x04, 0x02),
+    ")": (0x08, 0x04, 0x02, 0x02, 0x02, 0x04, 0x08),
+    ":": (0x00, 0x0C, 0x0C, 0x00, 0x0C, 0x0C, 0x00),
+    "=": (0x00, 0x00, 0x1F, 0x00, 0x1F, 0x00, 0x00),
+    "/": (0x00, 0x01, 0x02, 0x04, 0x08, 0x10, 0x00),
+    "+": (0x00, 0x04, 0x04, 0x1F, 0x04, 0x04, 0x00),
+    "%": (0x18, 0x19, 0x02, 0x04, 0x08, 0x13, 0x03),
+    "?": (0x0E, 0x11, 0x01, 0x02, 0x04, 0x00, 0x04),
+}
+
+GLYPH_H, GLYPH_W = 7, 5
+_BITS = 1 << np.arange(GLYPH_W - 1, -1, -1)
+
+
+def _glyph(char):
+    rows = _FONT_5X7.get(char.upper(), _FONT_5X7["?"])
+    return (np.array(rows)[:, None] & _BITS) > 0
+
+
+def render_text(text, scale=1):
+    """Render teks menjadi mask boolean (tinggi 7*scale), 1 kolom jarak antar huruf."""
+    if not text:
+        return np.zeros((GLYPH_H * scale, 0), dtype=bool)
+    spacer = np.zeros((GLYPH_H, 1), dtype=bool)
+    parts = []
+    for char in text:
+        parts.extend([_glyph(char), spacer])
+    bitmap = np.hstack(parts[:-1])
+    return np.kron(bitmap, np.ones((scale, scale), dtype=bool))
+
+
+def _draw_text(canvas, text, top, left, width, scale):
+    """Tulis teks (hitam) ke canvas, dipotong agar muat dalam width piksel."""
+    char_w = (GLYPH_W + 1) * scale
+    max_chars = max(0, (width + scale) // char_w)
+    if len(text) > max_chars:
+        text = text[:max(0, max_chars - 2)] + ".." if max_chars >= 2 else ""
+    mask = render_text(text, scale)
+    h, w = mask.shape
+    # Rata tengah secara horizontal
+    left += max(0, (width - w) // 2)
+    canvas[top:top + h, left:left + w][mask] = 0
+
+
+def _to_rgb_uint8(img):
+    """
+    Normalisasi tile ke uint8 RGB. Gambar 2D diskalakan min-max seperti
+    imshow(cmap='gray'); gambar berwarna di-clip ke rentang dtype-nya.
+    """
+    img = np.asarray(img)
+    if img.ndim == 3 and img.shape[-1] == 4:
+        img = img[..., :3]
+
+    if img.ndim == 2:
+        img = img.astype(np.float64)
+        lo, hi = np.nanmin(img), np.nanmax(img)
+        img = (img - lo) / (hi - lo) if hi > lo else np.zeros_like(img)
+        img = np.repeat(img[..., None], 3, axis=-1)
+    elif img.dtype == np.uint8:
+        return img
+    elif np.issubdtype(img.dtype, np.integer):
+        img = img.astype(np.float64) / np.iinfo(img.dtype).max
+    return (np.clip(img, 0, 1) * 255 + 0.5).astype(np.uint8)
+
+
+def _fit_nearest(img, box):
+    """Resize nearest-neighbour (lewat indeks) agar muat di kotak box x box."""
+    h, w = img.shape[:2]
+    scale = min(box / h, box / w)
+    new_h, new_w = max(1, int(round(h * scale))), max(1, int(round(w * scale)))
+    rows = ((np.arange(new_h) + 0.5) * h / new_h).astype(np.intp)
+    cols = ((np.arange(new_w) + 0.5) * w / new_w).astype(np.intp)
+    return img[rows[:, None], cols]
+
+
+def compose_grid(images_dict, title="", n_rows=2, tile_size=256, pad=8,
+                 label_scale=2, title_scale=3):
+    """
+    Menyusun images_dict ({label: gambar}) menjadi grid n_rows baris
+    (urutan baris demi baris, sama seperti plot_comparison matplotlib)
+    dengan label di atas setiap tile dan judul di atas grid.
+    Mengembalikan array uint8 RGB.
+    """
+    n = len(images_dict)
+    n_cols = max(1, (n + n_rows - 1) // n_rows)
+
+    label_h = GLYPH_H * label_scale + pad
+    title_h = GLYPH_H * title_scale + 2 * pad if title else 0
+    cell_w = tile_size + pad
+    cell_h = label_h + tile_size + pad
+
+    canvas = np.full(
+        (title_h + n_rows * cell_h + pad, n_cols * cell_w + pad, 3), 255, dtype=np.uint8
+    )
+    if title:
+        _draw_text(canvas, title, pad, pad, canvas.shape[1] - 2 * pad, title_scale)
+
+    for i, (label, img) in enumerate(images_dict.items()):
+        row, col = divmod(i, n_cols)
+        top = title_h + row * cell_h + pad
+        left = col * cell_w + pad
+        _draw_text(canvas, str(label), top, left, tile_size, label_scale)
+
+        tile = _fit_nearest(_to_rgb_uint8(img), tile_size)
+        th, tw = tile.shape[:2]
+        # Tile tepat di bawah label, rata tengah secara horizontal
+        y0 = top + label_h
+        x0 = left + (tile_size - tw) // 2
+        canvas[y0:y0 + th, x0:x0 + tw] = tile
+
+    return canvas
@@ -0,0 +1,125 @@
+# Nama: Kayla Namira Mariadi
+# NIM: 13522050
+# Deskripsi: Eksekusi per-gambar secara paralel (process pool + shared memory).
+
+import os
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import backends
+import precision
+import utils
+
+
+def _share_image(img):
+    """
+    Menyalin gambar ke blok shared memory.
+    Mengembalikan objek SharedMemory dan descriptor (name, shape, dtype)
+    yang cukup kecil untuk dikirim ke worker tanpa menyalin piksel.
+    """
+    img = np.ascontiguousarray(img)
+    shm = shared_memory.SharedMemory(create=True, size=max(img.nbytes, 1))
+    view = np.ndarray(img.shape, dtype=img.dtype, buffer=shm.buf)
+    view[...] = img
+    return shm, (shm.name, img.shape, img.dtype.str)
+
+
+def _run_shared(process_fn, img_name, descriptor, base_output_dir, kwargs):
+    """
+    Dijalankan di worker: attach ke shared memory, bungkus sebagai array
+    read-only, lalu panggil process_fn seperti pada mode serial.
+    """
+    name, shape, dtype = descriptor
+    shm = shared_memory.SharedMemory(name=name)
+    img = None
+    try:
+        img = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        img.flags.writeable = False
+        return process_fn(img_name, img, base_output_dir, **kwargs)
+    finally:
+        try:
+            # Writer background mungkin masih memegang view ke shm
+            utils.flush_writer()
+        finally:
+            # Lepas referensi ke buffer sebelum shm ditutup
+            img = None
+            shm.close()
+
+
+def resolve_workers(workers):
+    """None/1 -> serial, 0 -> semua core, n -> n proses."""
+    if workers is None:
+        return 1
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def _init_worker(precision_name, backend_mode):
+    precision.set_precision(precision_name)
+    backends.set_mode(backend_mode)
+
+
+def _release(shm):
+    shm.close()
+    shm.unlink()
+
+
+def _collect(in_flight, all_params_log):
+    """Ambil hasil job tertua (urutan submit, bukan urutan selesai) lalu lepas shm-nya."""
+    future, shm = in_flight.popleft()
+    try:
+        all_params_log.extend(future.result())
+    finally:
+        _release(shm)
+
+
+def run_images(process_fn, imgs, base_output_dir, workers=None, **kwargs):
+    """
+    Menjalankan process_fn(img_name, img, base_output_dir, **kwargs) untuk
+    setiap gambar di imgs (dict, atau iterable (nama, gambar) seperti
+    utils.iter_images) dan menggabungkan log parameternya.
+
+    Dengan workers > 1 gambar disebar ke process pool; piksel dikirim lewat
+    shared memory, bukan salinan pickle. Paling banyak 2 x workers gambar
+    berada di shared memory sekaligus, sehingga iterable yang lazy tetap
+    dibaca sedikit demi sedikit. Urutan log selalu mengikuti urutan imgs
+    sehingga CSV yang dihasilkan stabil.
+    """
+    n_workers = resolve_workers(workers)
+    if isinstance(imgs, Mapping):
+        n_workers = min(n_workers, len(imgs))
+        imgs = imgs.items()
+    all_params_log = []
+
+    if n_workers <= 1:
+        for img_name, img in imgs:
+            all_params_log.extend(process_fn(img_name, img, base_output_dir, **kwargs))
+        return all_params_log
+
+    in_flight = deque()
+    try:
+        # Setting global diteruskan eksplisit (tidak bergantung pada fork)
+        with ProcessPoolExecutor(
+            max_workers=n_workers, initializer=_init_worker,
+            initargs=(precision.float_dtype().name, backends.get_mode()),
+        ) as pool:
+            for img_name, img in imgs:
+                shm, descriptor = _share_image(img)
+                del img
+                in_flight.append((pool.submit(
+                    _run_shared, process_fn, img_name, descriptor, base_output_dir, kwargs
+                ), shm))
+                while len(in_flight) >= 2 * n_workers:
+                    _collect(in_flight, all_params_log)
+            while in_flight:
+                _collect(in_flight, all_params_log)
+    finally:
+        for _, shm in in_flight:
+            _release(shm)
+
+    return all_params_log
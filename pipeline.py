@@ -0,0 +1,557 @@
+# Nama: Kayla Namira Mariadi
+# NIM: 13522050
+# Deskripsi: Satu entry point untuk keempat modul: graf dependensi node
+#            (gambar, operasi) lintas modul dengan deduplikasi node identik,
+#            eksekusi paralel node yang independen, dan pembebasan hasil
+#            antara segera setelah konsumen terakhirnya selesai.
+
+import argparse
+import functools
+import heapq
+import importlib
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+import numpy as np
+
+import backends
+import precision
+import scalespace
+import tiling
+import utils
+
+filtering = importlib.import_module("01_filtering.filtering")
+edge_detection = importlib.import_module("02_edge.edge_detection")
+featurepoints = importlib.import_module("03_featurepoints.featurepoints")
+geometry = importlib.import_module("04_geometry.geometry")
+
+MODULES = ("filter", "edge", "feature", "geometry")
+
+# modul -> (modul runner, nama file CSV); output default sama seperti runner
+RUNNERS = {
+    "filter": (filtering, "filter_parameters.csv"),
+    "edge": (edge_detection, "edge_parameters.csv"),
+    "feature": (featurepoints, "feature_parameters.csv"),
+    "geometry": (geometry, "geometry_worksheet.csv"),
+}
+
+# Opsi runner per modul yang tidak didukung pipeline; ditolak secara eksplisit
+# (bukan diabaikan) agar tidak ada yang mengira opsinya berlaku
+RUNNER_ONLY_ARGS = ("--incremental", "--profile", "--source", "--prefetch",
+                    "--store", "--no-png", "--pyramid")
+
+
+# ---------------------------------------------------------------------------
+# Graf & scheduler
+# ---------------------------------------------------------------------------
+
+class _Node:
+    __slots__ = ("func", "deps", "order", "dependents", "consumers", "waiting")
+
+    def __init__(self, func, deps, order):
+        self.func = func
+        self.deps = deps
+        self.order = order
+
+
+class Graph:
+    """
+    DAG node di-key dengan tuple hashable yang menggambarkan operasinya
+    (mis. ("op", backends.sobel, key input, params)). Node dengan key yang
+    sudah ada tidak ditambahkan lagi, sehingga operasi identik dari modul
+    berbeda hanya dihitung sekali. func dipanggil dengan hasil deps.
+    """
+
+    def __init__(self):
+        self.nodes = {}
+        self.deduplicated = 0
+
+    def add(self, key, func, deps=()):
+        if key in self.nodes:
+            self.deduplicated += 1
+            return key
+        missing = [dep for dep in deps if dep not in self.nodes]
+        if missing:
+            raise KeyError(f"dependensi belum ada di graf: {missing}")
+        self.nodes[key] = _Node(func, tuple(deps), len(self.nodes))
+        return key
+
+
+def _nbytes(value):
+    """Perkiraan ukuran hasil node (array, bundle, atau kontainer array)."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, utils.ImageBundle):
+        return sum(_nbytes(v) for v in vars(value).values())
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(v) for v in value)
+    return 0
+
+
+def run(graph, workers=None):
+    """
+    Menjalankan semua node graph di thread pool (workers, default 2).
+    Node siap dijalankan menurut urutan penambahan, sehingga gambar yang
+    lebih awal selesai lebih dulu. Hasil sebuah node dibuang begitu semua
+    konsumennya selesai (node tanpa konsumen langsung dibuang).
+    Error pertama dari node mana pun di-raise ulang.
+    Mengembalikan statistik eksekusi.
+    """
+    nodes = graph.nodes
+    for node in nodes.values():
+        node.waiting = len(node.deps)
+        node.consumers = 0
+        node.dependents = []
+    for key, node in nodes.items():
+        for dep in node.deps:
+            nodes[dep].consumers += 1
+            nodes[dep].dependents.append(key)
+
+    ready = [(node.order, key) for key, node in nodes.items() if node.waiting == 0]
+    heapq.heapify(ready)
+    results, sizes = {}, {}
+    live_bytes = peak_bytes = peak_nodes = 0
+    workers = max(1, workers or 2)
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(workers, thread_name_prefix="pipeline") as pool:
+        running = {}
+        try:
+            while ready or running:
+                while ready and len(running) < workers:
+                    _, key = heapq.heappop(ready)
+                    node = nodes[key]
+                    args = [results[dep] for dep in node.deps]
+                    running[pool.submit(node.func, *args)] = key
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = running.pop(future)
+                    node = nodes[key]
+                    result = future.result()
+                    # Lepas closure (mis. referensi ke gambar input)
+                    node.func = None
+                    if node.consumers:
+                        results[key] = result
+                        sizes[key] = _nbytes(result)
+                        live_bytes += sizes[key]
+                    del result
+
+                    for dep in node.deps:
+                        nodes[dep].consumers -= 1
+                        if nodes[dep].consumers == 0:
+                            del results[dep]
+                            live_bytes -= sizes.pop(dep)
+                    for child in node.dependents:
+                        nodes[child].waiting -= 1
+                        if nodes[child].waiting == 0:
+                            heapq.heappush(ready, (nodes[child].order, child))
+
+                    peak_bytes = max(peak_bytes, live_bytes)
+                    peak_nodes = max(peak_nodes, len(results))
+        except BaseException:
+            for future in running:
+                future.cancel()
+            raise
+
+    return {
+        "nodes": len(nodes),
+        "deduplicated": graph.deduplicated,
+        "peak_intermediate_mb": peak_bytes / 2**20,
+        "peak_intermediate_nodes": peak_nodes,
+        "elapsed_s": time.perf_counter() - start,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Fungsi node
+# ---------------------------------------------------------------------------
+
+def _constant(value):
+    return value
+
+
+def _apply(func, params, tile_budget, tile_workers, image):
+    result = tiling.apply(func, image, params, max_bytes=tile_budget, workers=tile_workers)
+    return precision.check(result, func.__name__)
+
+
+def _gray(image):
+    return precision.cast(utils.to_gray(image))
+
+
+def _as_float(image):
+    return image.astype(precision.float_dtype(), copy=False)
+
+
+def _pick_float(name, results):
+    return results[name].astype(precision.float_dtype())
+
+
+def _save(filepath, image):
+    utils.save_img(filepath, image)
+
+
+def _comparison(filepath, title, labels, converts, *tiles):
+    """Plot perbandingan dari hasil node; None (detektor tak tersedia) dilewati."""
+    images = {}
+    for label, convert, tile in zip(labels, converts, tiles):
+        if tile is not None:
+            images[label] = convert(tile) if convert is not None else tile
+    utils.plot_comparison(images, title, filepath)
+
+
+def _params_key(params):
+    return tuple(sorted((k, scalespace._freeze(v)) for k, v in params.items()))
+
+
+# ---------------------------------------------------------------------------
+# Perencanaan node per modul
+# ---------------------------------------------------------------------------
+
+class PipelinePlan:
+    """
+    Membangun Graph untuk gambar imgs dan modul yang dipilih. Representasi
+    gambar (gray, float, ...) menjadi node sendiri; jika sebuah konversi
+    tidak mengubah apa pun (mis. to_gray pada gambar 2D), key node input
+    dipakai langsung sehingga operasi di atasnya tetap ter-deduplikasi.
+    Baris CSV dikumpulkan di logs[modul][(indeks gambar, indeks config)].
+    """
+
+    def __init__(self, imgs, output_dirs, tile_budget=None, tile_workers=None):
+        self.graph = Graph()
+        self.imgs = imgs
+        self.output_dirs = output_dirs
+        self.tile_budget = tile_budget
+        self.tile_workers = tile_workers
+        self.logs = {module: {} for module in output_dirs}
+        # Overlay geometry (matplotlib) digambar di thread utama setelah graf
+        # selesai, lihat draw_overlays
+        self.overlays = {}
+
+    # --- representasi gambar -------------------------------------------------
+
+    def _representation(self, key, func, deps=()):
+        # Representasi dipakai bersama oleh semua modul; bukan duplikat operasi
+        if key in self.graph.nodes:
+            return key
+        return self.graph.add(key, func, deps)
+
+    def image(self, name):
+        return self._representation(("image", name), functools.partial(_constant, self.imgs[name]))
+
+    def gray(self, name):
+        if self.imgs[name].ndim == 2:
+            return self.image(name)
+        return self._representation(("gray", name), _gray, [self.image(name)])
+
+    def float_gray(self, name):
+        img = self.imgs[name]
+        # rgb2gray selalu menghasilkan float
+        if img.ndim == 3 or np.issubdtype(img.dtype, np.floating):
+            return self.gray(name)
+        return self._representation(("float_gray", name), precision.as_float, [self.gray(name)])
+
+    def float(self, name):
+        if np.issubdtype(self.imgs[name].dtype, np.floating):
+            return self.image(name)
+        return self._representation(("float", name), precision.as_float, [self.image(name)])
+
+    def feature_bundle(self, name):
+        # Bundle dari float gray: gray_u8 dihitung sekali untuk FAST & SIFT
+        return self._representation(("bundle", name), utils.ImageBundle, [self.float_gray(name)])
+
+    def op(self, func, input_key, params):
+        """Node func(input, **params); key identik untuk operasi identik."""
+        return self.graph.add(
+            ("op", func, input_key, _params_key(params)),
+            functools.partial(_apply, func, params, self.tile_budget, self.tile_workers),
+            [input_key],
+        )
+
+    def save(self, filepath, key):
+        return self.graph.add(("save", str(filepath)), functools.partial(_save, filepath), [key])
+
+    def comparison(self, filepath, title, tiles):
+        """tiles: list (label, key node, konversi atau None)."""
+        labels = [label for label, _, _ in tiles]
+        converts = [convert for _, _, convert in tiles]
+        return self.graph.add(
+            ("plot", str(filepath)),
+            functools.partial(_comparison, filepath, title, labels, converts),
+            [key for _, key, _ in tiles],
+        )
+
+    # --- modul ---------------------------------------------------------------
+
+    def plan_filter(self, index, name):
+        base = self.output_dirs["filter"]
+        img_dir = base / name
+        img = self.imgs[name]
+        self.save(img_dir / f"{name}_original.png", self.image(name))
+        tiles = [("Original", self.gray(name), None)]
+
+        for j, config in enumerate(filtering.FILTER_CONFIG):
+            params = config["base_params"].copy()
+            input_key = self.image(name)
+            if img.ndim == 3:
+                if config["requires_gray"]:
+                    input_key = self.gray(name)
+                else:
+                    params.update(config["color_params"])
+            out = self.op(config["function"], input_key, params)
+            self.save(img_dir / f"{name}_{config['name']}.png", out)
+            tiles.append((config["name"], out, utils.to_gray))
+
+            log_entry = {"image": name, "filter_name": config['name'], "notes": config['notes']}
+            log_entry.update(config["base_params"])
+            self.logs["filter"][(index, j)] = log_entry
+
+        self.comparison(base / f"comparison_{name}.png", f"Filter Comparison for {name}", tiles)
+
+    def plan_edge(self, index, name):
+        base = self.output_dirs["edge"]
+        img_dir = base / name
+        gray = self.gray(name)
+        self.save(img_dir / f"{name}_original_gray.png", gray)
+        tiles = [("Original (Grayscale)", gray, None)]
+
+        canny_configs = [c for c in edge_detection.EDGE_CONFIG if c["function"] is edge_detection.canny.canny]
+        canny_key = None
+        if canny_configs:
+            canny_key = self.graph.add(
+                ("canny", gray, tuple(c["name"] for c in canny_configs)),
+                functools.partial(edge_detection._run_canny_groups, configs=canny_configs),
+                [gray],
+            )
+
+        for j, config in enumerate(edge_detection.EDGE_CONFIG):
+            if config in canny_configs:
+                out = self.graph.add(
+                    ("pick_float", canny_key, config["name"]),
+                    functools.partial(_pick_float, config["name"]), [canny_key],
+                )
+            else:
+                # Sobel pada gray sama dengan entri sobel filtering -> satu node
+                result = self.op(config["function"], gray, config["params"].copy())
+                out = self.graph.add(("as_float", result), _as_float, [result])
+            self.save(img_dir / f"{name}_{config['name']}.png", out)
+            tiles.append((config["name"], out, None))
+
+            log_entry = {"image": name, "method": config['name'], "notes": config['notes']}
+            log_entry.update(config["params"])
+            self.logs["edge"][(index, j)] = log_entry
+
+        self.comparison(base / f"comparison_{name}.png", f"Edge Detection Comparison for {name}", tiles)
+
+    def plan_feature(self, index, name):
+        base = self.output_dirs["feature"]
+        img_dir = base / name
+        img_gray = self.float_gray(name)
+        img_float = self.float(name)
+        bundle = self.feature_bundle(name)
+        self.save(img_dir / f"{name}_original_gray.png", img_gray)
+        detections = []
+
+        harris_configs = [
+            c for c in featurepoints.FEATURE_CONFIG if c["function"] is featurepoints._detect_harris
+        ]
+        harris_key = self.graph.add(
+            ("harris", img_gray, tuple(c["name"] for c in harris_configs)),
+            functools.partial(featurepoints._run_harris_groups, configs=harris_configs),
+            [bundle],
+        )
+
+        for j, config in enumerate(featurepoints.FEATURE_CONFIG):
+            detect = self.graph.add(
+                ("detect", img_gray, config["name"]),
+                functools.partial(_detect, config), [bundle, harris_key],
+            )
+            output_filename = img_dir / f"{name}_{config['name']}.png"
+            self.graph.add(
+                ("emit", str(output_filename)),
+                functools.partial(self._emit_feature, index, j, name, config, output_filename),
+                [detect, img_float],
+            )
+            detections.append(detect)
+
+        # Penanda di tile comparison digambar di atas gambar gray
+        plot_filepath = base / f"comparison_{name}.png"
+        self.graph.add(
+            ("plot", str(plot_filepath)),
+            functools.partial(
+                _feature_comparison, plot_filepath, f"Feature Detection Comparison for {name}",
+                [c["name"] for c in featurepoints.FEATURE_CONFIG],
+            ),
+            [img_gray] + detections,
+        )
+
+    def _emit_feature(self, index, j, name, config, output_filename, result, img_float):
+        if result is None:
+            return
+        coords, responses = result
+        utils.save_img(output_filename, utils.create_marked_image(img_float, coords))
+        self.logs["feature"][(index, j)] = featurepoints.feature_log_entry(
+            name, config, coords, responses
+        )
+
+    def plan_geometry(self, index, name):
+        base = self.output_dirs["geometry"]
+        img_gray = self.float_gray(name)
+        h, w = self.imgs[name].shape[:2]
+        src_pts_4 = geometry.corner_points(h, w)
+
+        for j, config in enumerate(geometry.build_transform_config(h, w)):
+            warped = self.graph.add(
+                ("transform", img_gray, config["name"]),
+                functools.partial(geometry.apply_transform, config), [img_gray],
+            )
+            self.graph.add(
+                ("emit", str(base / f"matrix_{config['name']}.txt")),
+                functools.partial(self._emit_transform, index, j, config, src_pts_4),
+                [img_gray, warped],
+            )
+
+    def _emit_transform(self, index, j, config, src_pts_4, img_gray, transformed):
+        t, warped_img = transformed
+        if t is None:
+            print(f"  ERROR: Estimasi matriks gagal untuk {config['name']}")
+            return
+        base = self.output_dirs["geometry"]
+        self.overlays[(index, j)] = (
+            img_gray, warped_img, src_pts_4, geometry.overlay_dst_points(config, t, src_pts_4),
+            config['name'], base / f"overlay_{config['name']}.png"
+        )
+        geometry.save_transform_matrix(config, t, base)
+        self.logs["geometry"][(index, j)] = geometry.transform_log_entry(config)
+
+    def draw_overlays(self):
+        """
+        Menggambar overlay geometry di thread pemanggil, urut seperti runner.
+        pyplot tidak thread-safe dan cache font matplotlib per thread, sehingga
+        teks yang digambar di thread worker bisa berbeda piksel dengan output
+        runner; di thread utama PNG-nya identik.
+        """
+        for key in sorted(self.overlays):
+            geometry.plot_transform_overlay(*self.overlays.pop(key))
+
+    def build(self):
+        for index, name in enumerate(self.imgs):
+            for module in self.output_dirs:
+                if module == "geometry":
+                    # Modul geometry hanya memakai checkerboard
+                    if name == "checkerboard":
+                        self.plan_geometry(index, name)
+                    continue
+                getattr(self, f"plan_{module}")(index, name)
+        return self.graph
+
+
+def _detect(config, bundle, harris_results):
+    return featurepoints.detect_features(config, bundle, harris_results)
+
+
+def _feature_comparison(filepath, title, labels, img_gray, *results):
+    """Tile: gray asli + penanda keypoint di atas gray untuk setiap detektor."""
+    images = {"Original (Grayscale)": img_gray}
+    for label, result in zip(labels, results):
+        if result is not None:
+            images[label] = utils.create_marked_image(img_gray, result[0])
+    utils.plot_comparison(images, title, filepath)
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def default_output_dirs(modules, output_root=None):
+    """Folder output per modul: folder runner-nya, atau output_root/<folder runner>."""
+    dirs = {}
+    for module in modules:
+        runner_dir = Path(RUNNERS[module][0].__file__).resolve().parent
+        dirs[module] = runner_dir if output_root is None else Path(output_root) / runner_dir.name
+    return dirs
+
+
+def run_pipeline(modules=MODULES, output_root=None, workers=None,
+                 tile_budget=None, tile_workers=None):
+    """
+    Memuat gambar sekali, membangun graf untuk semua modul, menjalankannya,
+    lalu menulis CSV setiap modul (urutan baris sama seperti runner).
+    Mengembalikan statistik eksekusi.
+    """
+    print("--- Pipeline: " + ", ".join(modules) + " ---")
+    imgs = utils.load_images()
+    output_dirs = default_output_dirs(modules, output_root)
+    for directory in output_dirs.values():
+        directory.mkdir(parents=True, exist_ok=True)
+
+    plan = PipelinePlan(imgs, output_dirs, tile_budget, tile_workers)
+    graph = plan.build()
+    # Gambar hanya dipegang oleh node "image" (dibebaskan setelah konsumen terakhir)
+    del imgs, plan.imgs
+
+    stats = run(graph, workers)
+    plan.draw_overlays()
+    utils.flush_writer()
+
+    for module, directory in output_dirs.items():
+        logs = plan.logs[module]
+        utils.save_params_to_csv(directory / RUNNERS[module][1], [logs[k] for k in sorted(logs)])
+
+    print(
+        f"\n{stats['nodes']} node ({stats['deduplicated']} duplikat digabung) dalam "
+        f"{stats['elapsed_s']:.2f} s; puncak hasil antara {stats['peak_intermediate_mb']:.1f} MB "
+        f"({stats['peak_intermediate_nodes']} node)"
+    )
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Menjalankan keempat modul dalam satu graf")
+    parser.add_argument(
+        "--modules", default=",".join(MODULES),
+        help=f"Modul yang dijalankan, dipisah koma ({', '.join(MODULES)})."
+    )
+    parser.add_argument("--workers", type=int, default=2, help="Jumlah thread eksekusi node.")
+    parser.add_argument(
+        "--output", default=None,
+        help="Folder output (default: folder masing-masing modul, sama seperti runner)."
+    )
+    tiling.add_tiling_args(parser)
+    utils.add_writer_args(parser)
+    precision.add_precision_args(parser)
+    backends.add_backend_args(parser)
+    for flag in RUNNER_ONLY_ARGS:
+        parser.add_argument(flag, nargs="?", const=True, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    given = [flag for flag in RUNNER_ONLY_ARGS if getattr(args, flag[2:].replace("-", "_")) is not None]
+    if given:
+        parser.error(
+            f"{', '.join(given)} tidak didukung pipeline.py; opsi ini hanya ada di runner per modul "
+            "(mis. python -m 01_filtering.filtering)"
+        )
+
+    modules = [m.strip() for m in args.modules.split(",") if m.strip()]
+    unknown = [m for m in modules if m not in MODULES]
+    if unknown:
+        parser.error(f"modul tidak dikenal: {', '.join(unknown)}")
+
+    precision.set_from_args(args)
+    backends.set_from_args(args)
+    utils.start_writer_from_args(args)
+    try:
+        run_pipeline(
+            modules, output_root=args.output, workers=args.workers,
+            tile_budget=tiling.budget_from_args(args), tile_workers=args.tile_workers,
+        )
+    finally:
+        utils.stop_writer()
+
+
+if __name__ == "__main__":
+    main()
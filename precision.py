@@ -0,0 +1,92 @@
+# Nama: Kayla Namira Mariadi
+# NIM: 13522050
+# Deskripsi: Setting presisi global (float64 / float32) untuk semua modul,
+#            beserta peringatan untuk operasi yang diam-diam meng-upcast.
+
+import warnings
+
+import numpy as np
+from skimage import img_as_float, img_as_float32
+
+PRECISIONS = {
+    "float64": np.dtype(np.float64),
+    "float32": np.dtype(np.float32),
+}
+
+# Toleransi terukur mode float32 terhadap float64 pada gambar contoh:
+# PNG filter, Sobel, dan geometry berbeda maks. 1 level abu-abu (1/255);
+# piksel Canny yang berubah (tepat di threshold) < 1e-5 dari gambar; jumlah
+# keypoint bergeser < 0.5% (FAST/ORB pada gambar float).
+TOLERANCE = {
+    "pixel_levels": 1,
+    "canny_changed_fraction": 1e-5,
+    "keypoint_count_rel": 0.005,
+}
+
+_FLOAT_DTYPE = PRECISIONS["float64"]
+# Nama operasi yang sudah diperingatkan (sekali per proses)
+_WARNED = set()
+
+
+class UpcastWarning(UserWarning):
+    """Operasi menghasilkan float yang lebih lebar dari presisi aktif."""
+
+
+def set_precision(name):
+    """Aktifkan presisi "float64" (default) atau "float32" untuk semua modul."""
+    global _FLOAT_DTYPE
+    if name not in PRECISIONS:
+        raise ValueError(f"presisi tidak dikenal: {name} (pilih {', '.join(PRECISIONS)})")
+    _FLOAT_DTYPE = PRECISIONS[name]
+
+
+def float_dtype():
+    """dtype float aktif (pengganti `float` pada astype)."""
+    return _FLOAT_DTYPE
+
+
+def as_float(image):
+    """img_as_float pada presisi aktif (uint8 -> [0, 1], float dipertahankan)."""
+    if _FLOAT_DTYPE == np.float64:
+        return img_as_float(image)
+    return img_as_float32(image)
+
+
+def cast(array):
+    """
+    Turunkan array float yang lebih lebar dari presisi aktif tanpa
+    peringatan; untuk konversi yang disengaja (mis. rgb2gray pada uint8).
+    """
+    if np.issubdtype(array.dtype, np.floating) and array.dtype.itemsize > _FLOAT_DTYPE.itemsize:
+        return array.astype(_FLOAT_DTYPE)
+    return array
+
+
+def check(array, name):
+    """
+    Hasil operasi name pada presisi aktif. Jika operasi meng-upcast (mis.
+    filter skimage pada input uint8 selalu menghasilkan float64 di mode
+    float32), UpcastWarning dimunculkan sekali per operasi lalu hasilnya
+    diturunkan. Di mode float64 array dikembalikan apa adanya.
+    """
+    if np.issubdtype(array.dtype, np.floating) and array.dtype.itemsize > _FLOAT_DTYPE.itemsize:
+        if name not in _WARNED:
+            _WARNED.add(name)
+            warnings.warn(
+                f"{name}: hasil {array.dtype} pada mode {_FLOAT_DTYPE.name}, diturunkan ke {_FLOAT_DTYPE.name}",
+                UpcastWarning, stacklevel=2,
+            )
+        return array.astype(_FLOAT_DTYPE)
+    return array
+
+
+def add_precision_args(parser):
+    """Opsi CLI --precision (dipakai semua runner)."""
+    parser.add_argument(
+        "--precision", choices=list(PRECISIONS), default="float64",
+        help="Presisi float pipeline (float32 menghemat ~separuh memori). Default: float64."
+    )
+
+
+def set_from_args(args):
+    set_precision(args.precision)
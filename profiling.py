@@ -0,0 +1,189 @@
+# Nama: Kayla Namira Mariadi
+# NIM: 13522050
+# Deskripsi: Instrumentasi per stage (wall time, CPU time, peak alokasi)
+#            untuk process_one_image di setiap runner.
+
+import contextlib
+import threading
+import time
+import tracemalloc
+
+import utils
+
+# Prefix kolom untuk stage tingkat gambar (konversi, plot, ...) yang
+# disalin ke setiap entri log gambar tersebut
+IMAGE_PREFIX = "image_"
+_METRICS = ("wall_ms", "cpu_ms", "peak_mb")
+_NULL_STAGE = contextlib.nullcontext()
+# Prefix nama thread yang bekerja di luar stage yang sedang diukur
+_BACKGROUND_THREADS = ("image-reader",)
+
+
+class StageProfiler:
+    """
+    Mengukur stage lewat `with profiler.stage("nama"):`. Hasil dikumpulkan
+    sampai pop() dipanggil, yang mengembalikan kolom {nama}_wall_ms
+    (perf_counter), {nama}_cpu_ms, dan {nama}_peak_mb (alokasi puncak di atas
+    alokasi saat stage dimulai, via tracemalloc). Stage dengan nama sama
+    dijumlahkan (peak diambil maksimum).
+
+    process_time dan tracemalloc mencakup semua thread di proses, sehingga
+    dengan wall_only=True (lihat shared_process) hanya kolom wall_ms yang
+    dicatat.
+
+    Dengan enabled=False, stage() mengembalikan null context yang sama
+    setiap kali dan pop() mengembalikan dict kosong, sehingga overhead-nya
+    hampir nol. Stage tidak boleh bersarang (peak di-reset per stage).
+    """
+
+    def __init__(self, enabled=False, wall_only=False):
+        self.enabled = enabled
+        self.wall_only = wall_only
+        self._records = {}
+        if enabled and not wall_only and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stage(self, name):
+        if not self.enabled:
+            return _NULL_STAGE
+        if self.wall_only:
+            return self._measure_wall(name)
+        return self._measure(name)
+
+    @contextlib.contextmanager
+    def _measure_wall(self, name):
+        wall = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = (time.perf_counter() - wall) * 1000
+            old = self._records.get(name)
+            self._records[name] = (wall if old is None else old[0] + wall,)
+
+    @contextlib.contextmanager
+    def _measure(self, name):
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall = (time.perf_counter() - wall) * 1000
+            cpu = (time.process_time() - cpu) * 1000
+            peak = (tracemalloc.get_traced_memory()[1] - base) / 2**20
+            old = self._records.get(name)
+            if old is not None:
+                wall, cpu, peak = old[0] + wall, old[1] + cpu, max(old[2], peak)
+            self._records[name] = (wall, cpu, peak)
+
+    def pop(self, prefix=""):
+        """Kolom untuk stage yang tercatat sejak pop() terakhir, lalu reset."""
+        columns = {}
+        for name, values in self._records.items():
+            for metric, value in zip(_METRICS, values):
+                columns[f"{prefix}{name}_{metric}"] = round(value, 3)
+        self._records = {}
+        return columns
+
+
+def shared_process(tile_budget=None, tile_workers=None):
+    """
+    True jika thread lain bisa bekerja bersamaan dengan stage: writer PNG
+    background (--write-workers), prefetch decode (utils.iter_images), atau
+    pool tile dengan lebih dari satu worker. CPU time dan peak alokasi
+    mereka ikut terhitung, jadi profiler sebaiknya dibuat dengan wall_only.
+    """
+    if utils.writer_workers() > 0:
+        return True
+    if tile_budget is not None and (tile_workers or 1) > 1:
+        return True
+    return any(t.name.startswith(_BACKGROUND_THREADS) for t in threading.enumerate())
+
+
+def attach_image_stages(log_entries, *stage_columns):
+    """Salin kolom stage tingkat gambar ke setiap entri log gambar tersebut."""
+    columns = {}
+    for part in stage_columns:
+        columns.update(part)
+    if columns:
+        for entry in log_entries:
+            entry.update(columns)
+
+
+def is_timing_column(key):
+    return key.endswith(tuple(f"_{metric}" for metric in _METRICS))
+
+
+def csv_columns(log_entries):
+    """Urutan kolom CSV: kolom parameter dulu, kolom timing di akhir."""
+    columns = list(dict.fromkeys(key for entry in log_entries for key in entry))
+    return (
+        [c for c in columns if not is_timing_column(c)]
+        + [c for c in columns if is_timing_column(c)]
+    )
+
+
+def summarize(log_entries, run_columns=None):
+    """
+    Ringkasan per stage dari kolom timing di log_entries: jumlah panggilan,
+    total wall/CPU (ms), dan peak maksimum (MB); CPU/peak None jika stage
+    hanya diukur wall time-nya (wall_only). Kolom tingkat gambar
+    (prefix IMAGE_PREFIX) dihitung sekali per gambar. run_columns berisi
+    stage tingkat run (mis. load) dari StageProfiler.pop().
+    """
+    totals = {}
+
+    def add(stage, metric, value):
+        calls, wall, cpu, peak = totals.get(stage, (0, 0.0, None, None))
+        if metric == "wall_ms":
+            calls, wall = calls + 1, wall + value
+        elif metric == "cpu_ms":
+            cpu = (cpu or 0.0) + value
+        else:
+            peak = max(peak or 0.0, value)
+        totals[stage] = (calls, wall, cpu, peak)
+
+    def add_columns(columns, prefix=""):
+        for key, value in columns.items():
+            for metric in _METRICS:
+                suffix = f"_{metric}"
+                if key.endswith(suffix) and key.startswith(prefix):
+                    add(key[len(prefix):-len(suffix)], metric, value)
+
+    seen_images = set()
+    for entry in log_entries:
+        entry_columns = {k: v for k, v in entry.items() if not k.startswith(IMAGE_PREFIX)}
+        add_columns(entry_columns)
+        image = entry.get("image")
+        if image not in seen_images:
+            seen_images.add(image)
+            add_columns(entry, IMAGE_PREFIX)
+    add_columns(run_columns or {})
+
+    def rounded(value):
+        return None if value is None else round(value, 3)
+
+    return [
+        {"stage": stage, "calls": calls, "wall_ms": round(wall, 3),
+         "cpu_ms": rounded(cpu), "peak_mb": rounded(peak)}
+        for stage, (calls, wall, cpu, peak) in totals.items()
+    ]
+
+
+def print_summary(rows):
+    print("\nRingkasan profiling per stage:")
+    print(f"  {'stage':<12} {'calls':>6} {'wall ms':>11} {'cpu ms':>11} {'peak MB':>9}")
+    for row in rows:
+        cpu = "-" if row["cpu_ms"] is None else f"{row['cpu_ms']:.1f}"
+        peak = "-" if row["peak_mb"] is None else f"{row['peak_mb']:.2f}"
+        print(
+            f"  {row['stage']:<12} {row['calls']:>6} {row['wall_ms']:>11.1f} "
+            f"{cpu:>11} {peak:>9}"
+        )
+
+
+def add_profile_args(parser):
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="Tambahkan kolom wall/CPU time & peak alokasi per stage ke CSV, plus ringkasan."
+    )
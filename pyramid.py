@@ -0,0 +1,141 @@
+# Nama: Kayla Namira Mariadi
+# NIM: 13522050
+# Deskripsi: Deteksi keypoint coarse-to-fine untuk gambar sangat besar:
+#            kandidat dicari pada level pyramid yang diperkecil, lalu
+#            detektor dijalankan ulang hanya di jendela kecil sekitar
+#            kandidat pada resolusi penuh.
+
+import cv2
+import numpy as np
+
+# Gambar lebih kecil dari ini selalu dideteksi pada resolusi penuh
+MIN_PIXELS = 4_000_000
+# Sisi blok grid (piksel resolusi penuh), satuan jendela refine
+WINDOW = 128
+# Level kasar memakai threshold x CANDIDATE_RELAX dan n_keypoints x
+# CANDIDATE_FACTOR, karena downsampling meredam corner halus
+CANDIDATE_RELAX = 0.5
+CANDIDATE_FACTOR = 2
+
+
+def factor_for(levels):
+    """Faktor downsampling untuk jumlah level pyramid (setiap level 1/2)."""
+    return 2 ** int(levels)
+
+
+def enabled(shape, levels):
+    """Mode pyramid aktif untuk gambar berukuran shape (>= MIN_PIXELS)."""
+    return bool(levels) and shape[0] * shape[1] >= MIN_PIXELS
+
+
+def downsample(image, factor):
+    """Level pyramid dengan faktor bilangan bulat (rata-rata per blok, dtype sama)."""
+    h, w = image.shape[:2]
+    size = (max(1, w // factor), max(1, h // factor))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+
+def to_full(coords, factor):
+    """Koordinat (row, col) level kasar -> pusat blok pada resolusi penuh."""
+    return np.asarray(coords, dtype=float).reshape(-1, 2) * factor + (factor - 1) / 2
+
+
+def refine_regions(candidates, shape, radius, window=WINDOW):
+    """
+    Persegi (y0, y1, x0, x1) resolusi penuh yang harus dideteksi ulang:
+    blok grid window x window yang berjarak <= radius dari kandidat
+    (koordinat resolusi penuh). Blok bersebelahan dalam satu baris grid
+    digabung, lalu run dengan kolom sama di baris grid berurutan juga
+    digabung, agar halo tidak dihitung berulang.
+    Mengembalikan (regions, coverage) dengan coverage = fraksi luas gambar.
+    """
+    if radius > window:
+        raise ValueError("radius refine harus <= window")
+    h, w = shape
+    grid = np.zeros((-(-h // window), -(-w // window)), dtype=bool)
+    if len(candidates):
+        limit = np.array(grid.shape) - 1
+        low = np.clip(((candidates - radius) // window).astype(int), 0, limit)
+        high = np.clip(((candidates + radius) // window).astype(int), 0, limit)
+        # radius <= window -> kandidat menyentuh paling banyak 2 blok per sumbu
+        for rows in (low[:, 0], high[:, 0]):
+            for cols in (low[:, 1], high[:, 1]):
+                grid[rows, cols] = True
+
+    regions, open_runs = [], {}
+    for by, row in enumerate(grid):
+        padded = np.concatenate([[False], row, [False]])
+        edges = np.flatnonzero(padded[1:] != padded[:-1])
+        runs = {}
+        for bx0, bx1 in zip(edges[::2], edges[1::2]):
+            # Run dengan kolom sama di baris grid sebelumnya diperpanjang
+            y0 = open_runs.pop((bx0, bx1), by)
+            runs[(bx0, bx1)] = y0
+        for (bx0, bx1), y0 in open_runs.items():
+            regions.append((y0, by, bx0, bx1))
+        open_runs = runs
+    for (bx0, bx1), y0 in open_runs.items():
+        regions.append((y0, grid.shape[0], bx0, bx1))
+
+    regions = [
+        (y0 * window, min(y1 * window, h), x0 * window, min(x1 * window, w))
+        for y0, y1, x0, x1 in sorted(regions)
+    ]
+    return regions, float(grid.mean()) if grid.size else 0.0
+
+
+def detect_regions(image, regions, detect_crop, halo):
+    """
+    detect_crop(crop) -> (coords, responses) dijalankan pada setiap region
+    beserta halo-nya; hanya keypoint di dalam region (bukan halo) yang
+    dipakai, digeser ke koordinat gambar penuh.
+    """
+    h, w = image.shape[:2]
+    coords_list, responses_list = [], []
+    for y0, y1, x0, x1 in regions:
+        top, left = max(0, y0 - halo), max(0, x0 - halo)
+        crop = image[top:min(h, y1 + halo), left:min(w, x1 + halo)]
+        coords, responses = detect_crop(crop)
+        coords = np.asarray(coords).reshape(-1, 2) + (top, left)
+        inside = (
+            (coords[:, 0] >= y0) & (coords[:, 0] < y1)
+            & (coords[:, 1] >= x0) & (coords[:, 1] < x1)
+        )
+        coords_list.append(coords[inside])
+        responses_list.append(np.asarray(responses)[inside])
+    if not coords_list:
+        return np.empty((0, 2)), np.empty((0,))
+    return np.concatenate(coords_list), np.concatenate(responses_list)
+
+
+def detect(image, candidates, factor, detect_crop, halo, select=None, window=WINDOW):
+    """
+    Deteksi coarse-to-fine. candidates: koordinat (row, col) dari detektor
+    pada downsample(image, factor). Setiap kandidat membuka jendela refine
+    (radius = factor piksel resolusi penuh); detect_crop dijalankan di
+    jendela tersebut (lihat detect_regions) dan select(coords, responses)
+    memilih hasil akhir secara global (default: semua).
+    Mengembalikan (coords, responses, coverage).
+    """
+    regions, coverage = refine_regions(to_full(candidates, factor), image.shape[:2], factor, window)
+    coords, responses = detect_regions(image, regions, detect_crop, halo)
+    if select is not None:
+        coords, responses = select(coords, responses)
+    return coords, responses, coverage
+
+
+def top_n(n):
+    """Seleksi global n response tertinggi (seperti ORB/SIFT pada gambar penuh)."""
+    def select(coords, responses):
+        order = np.argsort(-responses, kind="stable")[:n]
+        return coords[order], responses[order]
+    return select
+
+
+def add_pyramid_args(parser):
+    """Opsi CLI mode pyramid (dipakai runner feature points)."""
+    parser.add_argument(
+        "--pyramid", type=int, default=0, metavar="LEVELS",
+        help="Deteksi coarse-to-fine: kandidat pada level 1/2^LEVELS, refine di jendela "
+             f"resolusi penuh (hanya gambar >= {MIN_PIXELS / 1e6:g} MP). Default: 0 (mati)."
+    )
@@ -0,0 +1,120 @@
+# Nama: Kayla Namira Mariadi
+# NIM: 13522050
+# Deskripsi: Gaussian rekursif (IIR) Young-van Vliet orde 3 dengan biaya
+#            per piksel konstan terhadap sigma, untuk smoothing sigma besar.
+
+import numpy as np
+from scipy import signal
+
+import precision
+
+# Sigma minimum: di bawah ini aproksimasi Young-van Vliet tidak akurat
+MIN_SIGMA = 0.5
+
+# Akurasi terukur terhadap filters.gaussian(mode="nearest") pada cameraman
+# (float [0, 1]). Tepi gambar tepat (inisialisasi Triggs-Sdika); sisa error
+# adalah aproksimasi kernel orde 3 dan mengecil seiring sigma:
+#   sigma          1       3       8       16      32
+#   max abs     5.4e-2  2.3e-2  1.3e-2  9.4e-3  5.7e-3
+#   RMS         4.7e-3  2.2e-3  2.5e-3  2.3e-3  1.8e-3
+#   level uint8    14      6       4       3       2
+# Waktu FHD float64 (1080x1920): filter eksak 51 / 148 / 483 / 937 ms untuk
+# sigma 1 / 8 / 32 / 64, rekursif ~100 ms untuk semua sigma (titik impas ~5).
+# Karena itu pakai untuk sigma besar; sigma kecil tetap lewat scalespace.gaussian.
+
+
+def yvv_coefficients(sigma):
+    """
+    Koefisien lfilter (b, a) Young & van Vliet (1995) untuk satu pass
+    (maju atau mundur); dua pass berurutan mengaproksimasi Gaussian sigma.
+    """
+    if sigma < MIN_SIGMA:
+        raise ValueError(f"sigma harus >= {MIN_SIGMA} untuk Gaussian rekursif")
+    if sigma >= 2.5:
+        q = 0.98711 * sigma - 0.96330
+    else:
+        q = 3.97156 - 4.14554 * np.sqrt(1 - 0.26891 * sigma)
+    b0 = 1.57825 + 2.44413 * q + 1.4281 * q**2 + 0.422205 * q**3
+    b1 = 2.44413 * q + 2.85619 * q**2 + 1.26661 * q**3
+    b2 = -(1.4281 * q**2 + 1.26661 * q**3)
+    b3 = 0.422205 * q**3
+    a = np.array([1.0, -b1 / b0, -b2 / b0, -b3 / b0])
+    b = np.array([1.0 - (b1 + b2 + b3) / b0])
+    return b, a
+
+
+def _triggs_matrix(a1, a2, a3):
+    """
+    Matriks M Triggs & Sdika (2006) untuk rekursi w[n] = x[n] + a1 w[n-1]
+    + a2 w[n-2] + a3 w[n-3]: state awal pass mundur yang tepat untuk tepi
+    'nearest' (sinyal diperpanjang konstan tak hingga ke kanan).
+    """
+    m = np.array([
+        [-a3 * a1 + 1 - a3 * a3 - a2, (a3 + a1) * (a2 + a3 * a1), a3 * (a1 + a3 * a2)],
+        [a1 + a3 * a2, -(a2 - 1) * (a2 + a3 * a1), -(a3 * a1 + a3 * a3 + a2 - 1) * a3],
+        [a3 * a1 + a2 + a1 * a1 - a2 * a2,
+         a1 * a2 + a3 * a2 * a2 - a1 * a3 * a3 - a3 ** 3 - a3 * a2 + a3,
+         a3 * (a1 + a3 * a2)],
+    ])
+    return m / ((1 + a1 - a2 + a3) * (1 - a1 - a2 - a3) * (1 + a2 + (a1 - a3) * a3))
+
+
+def _smooth_last_axis(x, sigma):
+    """Pass maju lalu mundur sepanjang sumbu terakhir (lfilter tervektorisasi atas sumbu lain)."""
+    n = x.shape[-1]
+    if n < 4:
+        # Perpanjang dengan nilai tepi (= tepi 'nearest'), hasil dipotong lagi
+        padded = np.concatenate([x, np.repeat(x[..., -1:], 4 - n, axis=-1)], axis=-1)
+        return _smooth_last_axis(padded, sigma)[..., :n]
+
+    b, a = yvv_coefficients(sigma)
+    m = _triggs_matrix(*(-a[1:])) * b[0]
+    # Output lampau (y[-1], y[-2], y[-3]) -> state awal lfilter (direct form II transposed)
+    history = np.array([[-a[k + j + 1] if k + j < 3 else 0.0 for k in range(3)] for j in range(3)])
+    # Koefisien mengikuti dtype data agar float32 tetap float32
+    dtype = x.dtype
+    b, a, m, history = (c.astype(dtype) for c in (b, a, m, history))
+
+    # Maju: state steady-state untuk sinyal konstan senilai sampel pertama
+    first, last = x[..., :1], x[..., -1:]
+    zi = signal.lfilter_zi(b, a).astype(dtype)
+    forward, _ = signal.lfilter(b, a, x, zi=zi * first)
+
+    # Mundur: v[n-1], v[n], v[n+1] dari Triggs-Sdika, lanjut rekursi dari n-2 ke 0
+    tail = (forward[..., [-1, -2, -3]] - last) @ m.T + last
+    out = np.empty_like(forward)
+    out[..., -1] = tail[..., 0]
+    out[..., -2::-1], _ = signal.lfilter(b, a, forward[..., -2::-1], zi=tail @ history)
+    return out
+
+
+def recursive_gaussian(image, sigma=1.0, *, preserve_range=False, channel_axis=None):
+    """
+    Aproksimasi filters.gaussian (mode 'nearest') dengan filter rekursif
+    orde 3 per sumbu: biaya per piksel konstan berapa pun sigma-nya,
+    sehingga jauh lebih cepat untuk sigma besar (mis. estimasi background).
+    sigma skalar atau per sumbu spasial (>= MIN_SIGMA). channel_axis != None
+    memfilter setiap channel secara terpisah. Konversi dtype seperti
+    filters.gaussian (uint8 -> float [0, 1] kecuali preserve_range; float32
+    tetap float32), tetapi input integer langsung dihitung pada presisi
+    aktif sehingga tidak ada upcast di mode float32. Akurasi: lihat
+    komentar di awal modul.
+    """
+    image = np.asarray(image)
+    if preserve_range or image.dtype == bool:
+        dtype = np.float32 if image.dtype in (np.float16, np.float32) else precision.float_dtype()
+        data = image.astype(dtype)
+    else:
+        data = precision.as_float(image)
+        if data.dtype == np.float16:
+            data = data.astype(np.float32)
+
+    axes = list(range(data.ndim))
+    if channel_axis is not None:
+        axes.remove(channel_axis % data.ndim)
+    sigmas = np.broadcast_to(np.asarray(sigma, dtype=float), (len(axes),))
+
+    for axis, axis_sigma in zip(axes, sigmas):
+        smoothed = _smooth_last_axis(np.moveaxis(data, axis, -1), float(axis_sigma))
+        data = np.moveaxis(smoothed, -1, axis)
+    return np.ascontiguousarray(data)
@@ -0,0 +1,189 @@
+# Nama: Kayla Namira Mariadi
+# NIM: 13522050
+# Deskripsi: Penyimpanan hasil antara per (gambar, config) sebagai file .npy
+#            yang bisa di-memory-map: edge map boolean di-bit-pack, map float
+#            disimpan float32. PNG hanya view opsional di atasnya.
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+import utils
+
+INDEX_NAME = "index.json"
+
+# Jenis penyimpanan:
+# "bits"    -> array boolean (ndim >= 2), np.packbits sepanjang sumbu terakhir
+# "float32" -> array float apa pun, diturunkan ke float32
+# "raw"     -> dtype lain (mis. uint8) disimpan apa adanya
+
+
+def _encode(array):
+    """Array -> (jenis, data yang ditulis ke .npy)."""
+    array = np.asarray(array)
+    if array.dtype == bool and array.ndim >= 2:
+        return "bits", np.packbits(array, axis=-1)
+    if np.issubdtype(array.dtype, np.floating):
+        return "float32", array.astype(np.float32, copy=False)
+    return "raw", array
+
+
+def _write_atomic(path, write):
+    # Tulis ke file sementara lalu rename (pembaca tidak melihat file setengah jadi)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+class ResultsStore:
+    """
+    Hasil per gambar disimpan di root/<gambar>/<config>.npy, metadata
+    (jenis, shape, dtype asli) di root/<gambar>/index.json. Setiap gambar
+    hanya ditulis oleh satu proses (parallel.run_images membagi per gambar),
+    jadi index per gambar aman untuk runner dengan --workers.
+
+    Pembacaan lazy: get() me-memory-map file, sehingga hanya baris yang
+    diakses yang dibaca dari disk; map bit hanya di-unpack untuk baris
+    yang diminta.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._indexes = {}
+
+    def __repr__(self):
+        return f"ResultsStore({str(self.root)!r})"
+
+    def path(self, image, config):
+        return self.root / image / f"{config}.npy"
+
+    def _index(self, image):
+        if image not in self._indexes:
+            index_path = self.root / image / INDEX_NAME
+            try:
+                self._indexes[image] = json.loads(index_path.read_text())
+            except (OSError, ValueError):
+                self._indexes[image] = {}
+        return self._indexes[image]
+
+    def refresh(self):
+        """Lupakan index yang sudah dibaca (jika store ditulis proses lain)."""
+        self._indexes.clear()
+
+    def put(self, image, config, array):
+        """Simpan hasil config untuk gambar image. Mengembalikan path .npy."""
+        array = np.asarray(array)
+        kind, data = _encode(array)
+        path = self.path(image, config)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(path, lambda f: np.save(f, np.ascontiguousarray(data)))
+
+        index = self._index(image)
+        index[config] = {"kind": kind, "shape": list(array.shape), "dtype": array.dtype.str}
+        text = json.dumps(index, indent=1, sort_keys=True)
+        _write_atomic(self.root / image / INDEX_NAME, lambda f: f.write(text.encode()))
+        return path
+
+    def info(self, image, config):
+        """Metadata hasil: {"kind", "shape", "dtype"} (KeyError jika tidak ada)."""
+        try:
+            return self._index(image)[config]
+        except KeyError:
+            raise KeyError(f"tidak ada hasil {config!r} untuk gambar {image!r}") from None
+
+    def get(self, image, config, rows=None):
+        """
+        Hasil sebagai array read-only. Float dan raw dikembalikan sebagai
+        memmap (dtype tersimpan, float -> float32); map bit di-unpack ke
+        boolean. rows (slice atau indeks sumbu pertama) membatasi bagian
+        yang dibaca, mis. get(img, cfg, rows=slice(0, 64)).
+        """
+        info = self.info(image, config)
+        data = np.load(self.path(image, config), mmap_mode="r")
+        if rows is not None:
+            data = data[rows]
+        if info["kind"] != "bits":
+            return data
+        bits = np.unpackbits(data, axis=-1, count=info["shape"][-1])
+        return bits.view(bool)
+
+    def view(self, image, config):
+        """Hasil sebagai gambar float siap tampil/ekspor (map bit -> 0/1)."""
+        result = self.get(image, config)
+        if result.dtype == bool:
+            return result.astype(np.float32)
+        return np.asarray(result)
+
+    def export_png(self, image, config, filepath):
+        """Tulis PNG dari hasil tersimpan lewat utils.save_img."""
+        utils.save_img(filepath, self.view(image, config))
+
+    def images(self):
+        if not self.root.is_dir():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if (p / INDEX_NAME).exists())
+
+    def configs(self, image):
+        return list(self._index(image))
+
+    def __contains__(self, key):
+        image, config = key
+        return config in self._index(image) and self.path(image, config).exists()
+
+    def __getitem__(self, key):
+        image, config = key
+        return self.get(image, config)
+
+    def nbytes(self):
+        """Total ukuran file .npy di store (byte)."""
+        return sum(
+            self.path(image, config).stat().st_size
+            for image in self.images() for config in self.configs(image)
+        )
+
+
+def add_store_args(parser):
+    """Opsi CLI untuk results store (dipakai runner filtering dan edge)."""
+    parser.add_argument(
+        "--store", default=None, metavar="DIR",
+        help="Simpan setiap hasil juga sebagai .npy (memmap; edge map bit-packed) di DIR/<modul>."
+    )
+    parser.add_argument(
+        "--no-png", action="store_true",
+        help="Jangan tulis PNG per hasil (butuh --store; export belakangan dengan results_store.py)."
+    )
+
+
+def store_from_args(args, module):
+    """ResultsStore untuk modul (mis. "filter"), atau None tanpa --store."""
+    if args.store is None:
+        return None
+    return ResultsStore(Path(args.store) / module)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export hasil di results store menjadi PNG")
+    parser.add_argument("store", help="Direktori store satu modul (mis. store/filter)")
+    parser.add_argument("output", help="Direktori output PNG")
+    parser.add_argument("--image", action="append", help="Hanya gambar ini (boleh berulang)")
+    parser.add_argument("--config", action="append", help="Hanya config ini (boleh berulang)")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.store)
+    output_dir = Path(args.output)
+    count = 0
+    for image in args.image or store.images():
+        for config in store.configs(image):
+            if args.config and config not in args.config:
+                continue
+            store.export_png(image, config, output_dir / image / f"{image}_{config}.png")
+            count += 1
+    print(f"{count} PNG ditulis ke {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# Nama: Kayla Namira Mariadi
+# NIM: 13522050
+# Deskripsi: Cache scale-space Gaussian (LRU, dibatasi memori) yang dipakai
+#            bersama oleh modul filtering dan Canny.
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from skimage import filters
+
+import backends
+
+
+def fingerprint(img):
+    """Hash isi + shape + dtype array, dipakai sebagai bagian dari key cache."""
+    img = np.ascontiguousarray(img)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str((img.shape, img.dtype.str)).encode())
+    h.update(memoryview(img).cast("B"))
+    return h.hexdigest()
+
+
+def _freeze(value):
+    """Ubah nilai parameter menjadi bentuk hashable untuk key cache."""
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(np.asarray(value).ravel().tolist())
+    return value
+
+
+class ScaleSpaceCache:
+    """
+    Cache LRU untuk hasil blur Gaussian, di-key dengan (gambar, sigma,
+    parameter gaussian). Total ukuran array yang disimpan tidak melebihi
+    max_bytes; entri paling lama tidak dipakai dibuang lebih dulu.
+
+    Array yang dikembalikan bersifat read-only karena dibagi antar pemanggil;
+    salin dulu (.copy()) jika perlu dimodifikasi in-place.
+    """
+
+    def __init__(self, max_bytes=256 * 2**20):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        # Lookup & insert aman dipanggil dari beberapa thread (pipeline.py);
+        # compute() berjalan di luar lock
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """Ambil entri key, atau hitung dengan compute() lalu simpan."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        result = compute()
+        if isinstance(result, np.ndarray):
+            result.flags.writeable = False
+        if result.nbytes <= self.max_bytes:
+            with self._lock:
+                if key not in self._entries:
+                    self._entries[key] = result
+                    self.nbytes += result.nbytes
+                while self.nbytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.nbytes -= evicted.nbytes
+        return result
+
+    def gaussian(self, image, sigma=1, *, operation=backends.gaussian, **kwargs):
+        """
+        Sama seperti skimage.filters.gaussian (lewat operation, default
+        backends.gaussian), tetapi hasilnya di-cache. Pemanggilan dengan
+        argumen `out` tidak melewati cache.
+        """
+        if kwargs.get("out") is not None:
+            return filters.gaussian(image, sigma=sigma, **kwargs)
+        key = (
+            operation.name, fingerprint(image), _freeze(sigma),
+            tuple(sorted((k, _freeze(v)) for k, v in kwargs.items())),
+        )
+        return self.get_or_compute(
+            key, lambda: operation(image, sigma=sigma, **kwargs)
+        )
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+
+# Cache global per proses, dipakai oleh FILTER_CONFIG dan canny.canny
+CACHE = ScaleSpaceCache()
+
+
+def gaussian(image, sigma=1, **kwargs):
+    """Pengganti filters.gaussian yang mengambil hasil dari CACHE global."""
+    return CACHE.gaussian(image, sigma=sigma, **kwargs)
@@ -0,0 +1,342 @@
+# Nama: Kayla Namira Mariadi
+# NIM: 13522050
+# Deskripsi: Mode streaming untuk urutan frame (direktori frame atau dump
+#            video mentah): pipeline decode -> proses -> tulis dengan queue
+#            terbatas, sehingga memori tetap datar berapa pun panjang urutannya.
+
+import argparse
+import csv
+import importlib
+import queue
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+from skimage import io
+
+import backends
+import precision
+import scalespace
+import utils
+
+filtering = importlib.import_module("01_filtering.filtering")
+edge_detection = importlib.import_module("02_edge.edge_detection")
+featurepoints = importlib.import_module("03_featurepoints.featurepoints")
+
+# Jumlah frame terakhir yang dipakai untuk persentil latency
+LATENCY_WINDOW = 1000
+
+_DONE = object()
+
+
+# ---------------------------------------------------------------------------
+# Sumber frame
+# ---------------------------------------------------------------------------
+
+# Konversi sama seperti utils.load_images: gray tetap, warna -> float RGB
+prepare_frame = utils.prepare_image
+
+
+def iter_frame_dir(directory, pattern="*"):
+    """Yield (nama, frame) untuk setiap file gambar di directory, urut nama."""
+    for path in sorted(Path(directory).glob(pattern)):
+        if path.suffix.lower() in utils.IMAGE_SUFFIXES:
+            yield path.stem, prepare_frame(io.imread(path))
+
+
+def iter_raw_frames(path, shape, dtype="uint8"):
+    """
+    Yield (nama, frame) dari dump video mentah: frame berurutan dengan
+    shape (H, W) atau (H, W, C) tanpa header. File di-memory-map sehingga
+    hanya frame yang sedang dibaca yang masuk ke memori.
+    """
+    shape = tuple(shape)
+    frame_bytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    n_frames = Path(path).stat().st_size // frame_bytes
+    if n_frames == 0:
+        return
+    frames = np.memmap(path, dtype=dtype, mode="r", shape=(n_frames,) + shape)
+    for i in range(n_frames):
+        yield f"frame_{i:06d}", prepare_frame(np.array(frames[i]))
+
+
+# ---------------------------------------------------------------------------
+# Stack pemrosesan per frame: ImageBundle frame -> list (nama config, gambar output)
+# ---------------------------------------------------------------------------
+
+def filter_frame(bundle):
+    return [
+        (config["name"], filtering.apply_filter(config, bundle))
+        for config in filtering.FILTER_CONFIG
+    ]
+
+
+def edge_frame(bundle):
+    canny_results = edge_detection._run_canny_groups(bundle)
+    return [
+        (config["name"], edge_detection.apply_edge(config, bundle, canny_results))
+        for config in edge_detection.EDGE_CONFIG
+    ]
+
+
+def feature_frame(bundle):
+    harris_results = featurepoints._run_harris_groups(bundle)
+    outputs = []
+    for config in featurepoints.FEATURE_CONFIG:
+        result = featurepoints.detect_features(config, bundle, harris_results)
+        if result is not None:
+            outputs.append((config["name"], utils.create_marked_image(bundle.float, result[0])))
+    return outputs
+
+
+STACKS = {
+    "filter": filter_frame,
+    "edge": edge_frame,
+    "feature": feature_frame,
+}
+
+
+# ---------------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------------
+
+def _put(q, item, stop):
+    """q.put yang berhenti jika stage lain gagal (stop di-set)."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q, stop):
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return _DONE
+
+
+def _stage(target, errors, stop, out_q):
+    """Bungkus stage: error disimpan, stage lain dihentikan, _DONE diteruskan."""
+    def run():
+        try:
+            target()
+        except BaseException as exc:
+            errors.append(exc)
+            stop.set()
+        finally:
+            _put(out_q, _DONE, stop)
+    return threading.Thread(target=run, daemon=True)
+
+
+def stream_frames(frames, output_dir, stacks=("filter", "edge", "feature"),
+                  queue_size=4, compress_level=6):
+    """
+    Generator: menjalankan stack di `stacks` pada setiap (nama, frame) dari
+    iterable frames. Decode, proses, dan tulis berjalan di thread terpisah
+    yang dihubungkan queue berukuran queue_size, sehingga jumlah frame di
+    memori dibatasi ~3 * queue_size. Output ditulis ke
+    output_dir/<stack>/<config>/<nama frame>.png.
+
+    Yield (nama frame, stats) per frame setelah semua output-nya tertulis;
+    stats berisi decode_ms, process_ms, write_ms, dan latency_ms (dari
+    mulai decode sampai selesai ditulis).
+    """
+    output_dir = Path(output_dir)
+    stack_fns = [(name, STACKS[name]) for name in stacks]
+    decoded_q = queue.Queue(maxsize=queue_size)
+    processed_q = queue.Queue(maxsize=queue_size)
+    written_q = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    errors = []
+
+    def decode():
+        frame_iter = iter(frames)
+        while not stop.is_set():
+            start = time.perf_counter()
+            item = next(frame_iter, _DONE)
+            if item is _DONE:
+                return
+            name, frame = item
+            stats = {"decode_ms": (time.perf_counter() - start) * 1000}
+            if not _put(decoded_q, (name, frame, start, stats), stop):
+                return
+
+    def process():
+        while True:
+            item = _get(decoded_q, stop)
+            if item is _DONE:
+                return
+            name, frame, start, stats = item
+            t0 = time.perf_counter()
+            # Konversi gray/float/uint8 dibagi antar stack dalam satu frame
+            bundle = utils.ImageBundle(frame)
+            outputs = [(stack, fn(bundle)) for stack, fn in stack_fns]
+            del bundle
+            # Entri cache blur/Harris hanya berguna di dalam satu frame
+            scalespace.CACHE.clear()
+            stats["process_ms"] = (time.perf_counter() - t0) * 1000
+            # Frame input tidak diteruskan agar bisa segera dibebaskan
+            if not _put(processed_q, (name, outputs, start, stats), stop):
+                return
+
+    def write():
+        while True:
+            item = _get(processed_q, stop)
+            if item is _DONE:
+                return
+            name, outputs, start, stats = item
+            t0 = time.perf_counter()
+            for stack, results in outputs:
+                for config_name, img in results:
+                    path = output_dir / stack / config_name / f"{name}.png"
+                    utils._write_png(path, img, compress_level=compress_level)
+            end = time.perf_counter()
+            stats["write_ms"] = (end - t0) * 1000
+            stats["latency_ms"] = (end - start) * 1000
+            if not _put(written_q, (name, stats), stop):
+                return
+
+    threads = [
+        _stage(decode, errors, stop, decoded_q),
+        _stage(process, errors, stop, processed_q),
+        _stage(write, errors, stop, written_q),
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            item = _get(written_q, stop)
+            if item is _DONE:
+                break
+            yield item
+    finally:
+        # Konsumen berhenti lebih awal (atau error): hentikan semua stage
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        raise RuntimeError("Pipeline streaming gagal") from errors[0]
+
+
+class StreamStats:
+    """
+    Ringkasan latency & throughput dengan memori konstan: rata-rata dan
+    maksimum atas semua frame, persentil atas LATENCY_WINDOW frame terakhir.
+    """
+
+    def __init__(self):
+        self.frames = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.recent = deque(maxlen=LATENCY_WINDOW)
+        self.start = time.perf_counter()
+
+    def add(self, stats):
+        latency = stats["latency_ms"]
+        self.frames += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.recent.append(latency)
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.start
+        recent = np.array(self.recent) if self.recent else np.zeros(1)
+        return {
+            "frames": self.frames,
+            "elapsed_s": elapsed,
+            "throughput_fps": self.frames / elapsed if elapsed > 0 else 0.0,
+            "latency_mean_ms": self.total_latency / max(1, self.frames),
+            "latency_p50_ms": float(np.percentile(recent, 50)),
+            "latency_p95_ms": float(np.percentile(recent, 95)),
+            "latency_max_ms": self.max_latency,
+        }
+
+
+def run_stream(frames, output_dir, stacks=("filter", "edge", "feature"),
+               queue_size=4, compress_level=6, limit=None):
+    """
+    Menjalankan stream_frames, menulis statistik per frame ke
+    output_dir/stream_stats.csv secara inkremental, dan mengembalikan
+    ringkasan StreamStats.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stream_stats = StreamStats()
+    fields = ["frame", "decode_ms", "process_ms", "write_ms", "latency_ms"]
+
+    with open(output_dir / "stream_stats.csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for name, stats in stream_frames(frames, output_dir, stacks, queue_size, compress_level):
+            writer.writerow({"frame": name, **{k: f"{stats[k]:.2f}" for k in fields[1:]}})
+            stream_stats.add(stats)
+            print(f"  {name}: latency {stats['latency_ms']:.1f} ms")
+            if limit is not None and stream_stats.frames >= limit:
+                break
+
+    summary = stream_stats.summary()
+    print(
+        f"\n{summary['frames']} frame dalam {summary['elapsed_s']:.2f} s "
+        f"({summary['throughput_fps']:.2f} fps), latency rata-rata "
+        f"{summary['latency_mean_ms']:.1f} ms, p50 {summary['latency_p50_ms']:.1f} ms, "
+        f"p95 {summary['latency_p95_ms']:.1f} ms, max {summary['latency_max_ms']:.1f} ms"
+    )
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mode streaming frame sequence")
+    parser.add_argument("source", help="Direktori frame atau file dump video mentah")
+    parser.add_argument("output", help="Direktori output")
+    parser.add_argument(
+        "--stacks", default="filter,edge,feature",
+        help="Stack yang dijalankan, dipisah koma (filter, edge, feature)."
+    )
+    parser.add_argument(
+        "--raw-shape", default=None,
+        help="Shape frame untuk dump mentah, mis. 1080,1920,3. Wajib jika source berupa file."
+    )
+    parser.add_argument("--raw-dtype", default="uint8", help="dtype frame dump mentah.")
+    parser.add_argument("--queue-size", type=int, default=4, help="Ukuran tiap queue antar stage.")
+    parser.add_argument("--limit", type=int, default=None, help="Berhenti setelah N frame.")
+    parser.add_argument(
+        "--png-compress", type=int, default=6, choices=range(10), metavar="0-9",
+        help="Level kompresi zlib PNG."
+    )
+    precision.add_precision_args(parser)
+    backends.add_backend_args(parser)
+    args = parser.parse_args()
+    precision.set_from_args(args)
+    backends.set_from_args(args)
+
+    stacks = [s.strip() for s in args.stacks.split(",") if s.strip()]
+    unknown = [s for s in stacks if s not in STACKS]
+    if unknown:
+        parser.error(f"stack tidak dikenal: {', '.join(unknown)}")
+
+    source = Path(args.source)
+    if source.is_dir():
+        frames = iter_frame_dir(source)
+    else:
+        if args.raw_shape is None:
+            parser.error("--raw-shape wajib untuk source berupa file dump mentah")
+        shape = [int(v) for v in args.raw_shape.split(",")]
+        frames = iter_raw_frames(source, shape, args.raw_dtype)
+
+    run_stream(
+        frames, args.output, stacks=stacks, queue_size=args.queue_size,
+        compress_level=args.png_compress, limit=args.limit,
+    )
+
+
+if __name__ == "__main__":
+    main()
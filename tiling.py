@@ -0,0 +1,132 @@
+# Nama: Kayla Namira Mariadi
+# NIM: 13522050
+# Deskripsi: Eksekusi filter per strip (dengan halo) di thread pool agar
+#            memori puncak untuk gambar resolusi tinggi tetap dibatasi.
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+from skimage import filters
+
+import backends
+import median
+import scalespace
+
+# Perkiraan jumlah salinan float64 yang hidup bersamaan saat satu strip
+# difilter (konversi input, buffer antara filter separable, output)
+WORK_COPIES = 4
+
+
+def _gaussian_halo(params):
+    # Radius kernel ndi.gaussian_filter: int(truncate * sigma + 0.5)
+    sigma = np.max(np.atleast_1d(params.get("sigma", 1)))
+    return int(params.get("truncate", 4.0) * sigma + 0.5)
+
+
+def _footprint_halo(params):
+    footprint = params.get("footprint")
+    if footprint is None:
+        # Default filters.median: footprint 3x3
+        return 1
+    return max(np.asarray(footprint).shape) // 2
+
+
+# fungsi -> (halo(params), fungsi yang dijalankan per strip).
+# Strip Gaussian tidak lewat scalespace.CACHE: key per strip tidak pernah
+# dipakai ulang dan hanya akan menambah memori.
+# Canny tidak ada di sini karena hysteresis-nya global (tidak bisa di-tile).
+TILE_RULES = {
+    scalespace.gaussian: (_gaussian_halo, backends.gaussian),
+    backends.gaussian: (_gaussian_halo, backends.gaussian),
+    filters.gaussian: (_gaussian_halo, filters.gaussian),
+    median.histogram_median: (_footprint_halo, median.histogram_median),
+    filters.median: (_footprint_halo, filters.median),
+    filters.sobel: (lambda params: 1, filters.sobel),
+    backends.sobel: (lambda params: 1, backends.sobel),
+}
+
+
+def strip_rows(image, halo, max_bytes, workers):
+    """
+    Jumlah baris inti per strip sehingga `workers` strip (termasuk halo)
+    yang diproses bersamaan muat dalam max_bytes.
+    """
+    row_bytes = image[:1].size * 8 * WORK_COPIES
+    rows = max_bytes // (max(1, workers) * row_bytes) - 2 * halo
+    return int(max(1, rows))
+
+
+def _run_strip(func, image, params, y0, y1, halo):
+    """Filter baris [y0, y1) beserta halo-nya, lalu buang baris halo."""
+    top = max(0, y0 - halo)
+    bottom = min(image.shape[0], y1 + halo)
+    result = func(image[top:bottom], **params)
+    return y0, y1, result[y0 - top:y0 - top + (y1 - y0)]
+
+
+def apply(func, image, params, max_bytes=None, workers=None):
+    """
+    Menjalankan func(image, **params) per strip horizontal bila func punya
+    aturan halo di TILE_RULES dan max_bytes diberikan; selain itu func
+    dipanggil langsung. Halo setiap strip selebar radius filter, dan pada
+    tepi gambar yang asli border mode filter tetap berlaku, sehingga hasil
+    gabungan identik bit-per-bit dengan pemanggilan tanpa tiling.
+
+    max_bytes membatasi memori kerja strip yang diproses bersamaan (di luar
+    gambar input dan output penuh). workers = jumlah thread (default 1).
+    """
+    rule = TILE_RULES.get(func)
+    if max_bytes is None or rule is None:
+        return func(image, **params)
+
+    halo_fn, strip_func = rule
+    halo = halo_fn(params)
+    workers = max(1, workers or 1)
+    rows = strip_rows(image, halo, max_bytes, workers)
+    height = image.shape[0]
+    if rows >= height:
+        return func(image, **params)
+
+    bounds = [(y0, min(y0 + rows, height)) for y0 in range(0, height, rows)]
+    out = None
+
+    def store(future):
+        nonlocal out
+        y0, y1, part = future.result()
+        if out is None:
+            out = np.empty((height,) + part.shape[1:], dtype=part.dtype)
+        out[y0:y1] = part
+
+    # Maksimal `workers` strip yang berjalan bersamaan; hasil langsung
+    # disalin ke output agar strip yang selesai bisa dibebaskan
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for y0, y1 in bounds:
+            if len(pending) >= workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    store(future)
+            pending.add(pool.submit(_run_strip, strip_func, image, params, y0, y1, halo))
+        for future in pending:
+            store(future)
+
+    return out
+
+
+def add_tiling_args(parser):
+    """Opsi CLI untuk mode tiled (dipakai runner filtering dan edge)."""
+    parser.add_argument(
+        "--tile-budget", type=float, default=None, metavar="MB",
+        help="Aktifkan mode tiled dengan batas memori kerja strip (MB). Default: tanpa tiling."
+    )
+    parser.add_argument(
+        "--tile-workers", type=int, default=1,
+        help="Jumlah thread untuk memproses strip (default 1)."
+    )
+
+
+def budget_from_args(args):
+    """--tile-budget (MB) -> byte, atau None jika tiling tidak aktif."""
+    if args.tile_budget is None:
+        return None
+    return int(args.tile_budget * 2**20)
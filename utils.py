@@ -2,14 +2,55 @@
 # NIM: 13522050
 # Deskripsi: Modul helper untuk memuat gambar, menyimpan output, dan plotting
 
+import argparse
+import functools
+import glob
+import hashlib
+import itertools
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import imageio.v3 as iio
 import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgb
 import numpy as np
 import pandas as pd
+import skimage
 from pathlib import Path
-from skimage import data, img_as_float, io
+from skimage import data, img_as_float, img_as_float32, io
 from skimage.color import gray2rgb, rgb2gray
 from skimage.util import img_as_ubyte
-import io as skio
+
+import backends
+import mosaic
+import precision
+
+def build_arg_parser(description):
+    """
+    Parser argumen CLI bersama untuk semua runner modul.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Jumlah proses worker per gambar (0 = semua core). Default: serial."
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="Lewati output yang input, config, dan kodenya tidak berubah (manifest.json)."
+    )
+    parser.add_argument(
+        "--source", default=None,
+        help="Direktori atau pola glob gambar input (default: gambar bawaan)."
+    )
+    parser.add_argument(
+        "--prefetch", type=int, default=2,
+        help="Jumlah gambar yang di-decode lebih dulu di background (0 = tanpa prefetch)."
+    )
+    add_writer_args(parser)
+    precision.add_precision_args(parser)
+    backends.add_backend_args(parser)
+    return parser
 
 def to_gray(img):
     """Konversi gambar ke grayscale jika berwarna."""
@@ -17,22 +58,142 @@ def to_gray(img):
         return rgb2gray(img)
     return img
 
+class ImageBundle:
+    """
+    Satu gambar beserta representasi turunannya. Setiap representasi
+    dihitung sekali saat pertama diakses lalu disimpan, sehingga modul
+    yang memakai bundle yang sama tidak mengonversi ulang:
+      image       gambar asli (apa adanya)
+      gray        to_gray(image), dtype asli (filtering, edge)
+      float       image sebagai float [0, 1] (penanda keypoint)
+      float_gray  gray sebagai float [0, 1] (Harris, ORB, geometry)
+    Representasi float memakai presisi aktif (precision.set_precision).
+      gray_u8     float_gray * 255 dipotong ke uint8 (SIFT, FAST; sama
+                  seperti konversi di detektor sebelumnya)
+      float32     float_gray sebagai float32
+    Array yang dikembalikan dibagi bersama; jangan diubah in-place.
+    """
+
+    def __init__(self, image):
+        self.image = image
+
+    @property
+    def shape(self):
+        return self.image.shape
+
+    @property
+    def ndim(self):
+        return self.image.ndim
+
+    @functools.cached_property
+    def gray(self):
+        return precision.cast(to_gray(self.image))
+
+    @functools.cached_property
+    def float(self):
+        return precision.as_float(self.image)
+
+    @functools.cached_property
+    def float_gray(self):
+        # rgb2gray sudah menghasilkan float; sama dengan to_gray(img_as_float(image))
+        return precision.as_float(self.gray)
+
+    @functools.cached_property
+    def gray_u8(self):
+        if self.gray.dtype == np.uint8:
+            # Tabel hasil pemotongan float64, sama di kedua presisi
+            return _GRAY_U8_LUT[self.gray]
+        return (self.float_gray * 255).astype(np.uint8)
+
+    @functools.cached_property
+    def float32(self):
+        return self.float_gray.astype(np.float32)
+
+
+# (img_as_float(k) * 255).astype(uint8) untuk setiap level k; 24 level bergeser 1
+_GRAY_U8_LUT = (img_as_float(np.arange(256, dtype=np.uint8)) * 255).astype(np.uint8)
+
+def as_bundle(image):
+    """ImageBundle untuk image (dikembalikan apa adanya jika sudah bundle)."""
+    return image if isinstance(image, ImageBundle) else ImageBundle(image)
+
+# Cache hasil decode + konversi gambar (.npy, bisa di-memory-map).
+# Set ke None untuk mematikan cache.
+IMAGE_CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "images"
+
+# key: (nama file di skimage.data_dir, fungsi loader, konversi)
+SAMPLE_IMAGES = {
+    "cameraman": ("camera.png", data.camera, "gray"),
+    "coins": ("coins.png", data.coins, "gray"),
+    "checkerboard": ("chessboard_GRAY.png", data.checkerboard, "gray"),
+    "astronaut": ("astronaut.png", data.astronaut, "float"),
+    "chelsea": ("chelsea.png", data.chelsea, "float"),
+}
+
+_CONVERSIONS = {
+    "gray": to_gray,
+    "float": img_as_float,
+    "float32": img_as_float32,
+}
+
+def _file_digest(path):
+    """SHA-256 dari isi file sumber (dibaca per blok)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def load_cached(key, source_path, decode, conversion, cache_dir=None):
+    """
+    Memuat gambar hasil decode() + konversi dari cache .npy jika ada.
+    Cache di-key dengan hash isi file sumber, nama konversi, dan versi
+    scikit-image, lalu dibuka dengan mmap (read-only, tanpa salinan).
+    Jika file sumber tidak bisa di-hash, gambar di-decode biasa tanpa cache.
+    """
+    convert = _CONVERSIONS[conversion]
+    cache_dir = IMAGE_CACHE_DIR if cache_dir is None else cache_dir
+    source_path = Path(source_path)
+    if not cache_dir or not source_path.is_file():
+        return convert(decode())
+
+    tag = f"{_file_digest(source_path)}|{conversion}|{skimage.__version__}"
+    tag = hashlib.sha256(tag.encode()).hexdigest()[:16]
+    cache_path = Path(cache_dir) / f"{key}_{conversion}_{tag}.npy"
+
+    if not cache_path.exists():
+        arr = np.ascontiguousarray(convert(decode()))
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Tulis ke file sementara lalu rename agar proses lain tidak
+        # pernah membaca file .npy yang setengah jadi
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, arr)
+        os.replace(tmp_path, cache_path)
+
+    return np.asarray(np.load(cache_path, mmap_mode="r"))
+
+def _image_conversion(conversion):
+    # Gambar warna langsung dimuat (dan di-cache) pada presisi aktif
+    if conversion == "float" and precision.float_dtype() == np.float32:
+        return "float32"
+    return conversion
+
 def load_images():
     """
     Memuat dan memproses semua gambar standar dan tambahan.
     Mengembalikan dictionary berisi gambar-gambar.
+    Hasil decode disimpan di IMAGE_CACHE_DIR dan dipetakan (mmap, read-only)
+    pada pemanggilan berikutnya.
     """
     print("Memuat gambar...")
 
     personal_image_path = "personal.jpeg" 
     personal_image_key = "personal"
-    imgs = {
-        "cameraman": to_gray(data.camera()),
-        "coins": to_gray(data.coins()),
-        "checkerboard": to_gray(data.checkerboard()),
-        "astronaut": img_as_float(data.astronaut()), 
-        "chelsea": img_as_float(data.chelsea())      
-    }
+    imgs = {}
+    for key, (filename, loader, conversion) in SAMPLE_IMAGES.items():
+        source_path = Path(data.data_dir) / filename
+        imgs[key] = load_cached(key, source_path, loader, _image_conversion(conversion))
     try:
         try:
             root_dir = Path(__file__).resolve().parent
@@ -40,8 +201,10 @@ def load_images():
         except NameError:
             personal_image_path = Path(personal_image_path)
             
-        img_pribadi = io.imread(str(personal_image_path))
-        img_pribadi_float = img_as_float(img_pribadi)
+        img_pribadi_float = load_cached(
+            personal_image_key, personal_image_path,
+            lambda: io.imread(str(personal_image_path)), _image_conversion("float")
+        )
         imgs[personal_image_key] = img_pribadi_float
         
     except FileNotFoundError:
@@ -52,11 +215,78 @@ def load_images():
     print("Selesai memuat gambar.")
     return imgs
 
-def save_img(filepath, img):
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff"}
+
+def prepare_image(img):
+    """Konversi sama seperti load_images: gray tetap, warna -> float RGB (alpha dibuang)."""
+    if img.ndim == 3:
+        return precision.as_float(img[..., :3])
+    return img
+
+def decode_image(filepath):
+    return prepare_image(io.imread(str(filepath)))
+
+def list_image_files(source):
+    """File gambar di direktori source (tidak rekursif) atau yang cocok dengan pola glob, urut path."""
+    path = Path(source)
+    if path.is_dir():
+        candidates = path.iterdir()
+    else:
+        candidates = map(Path, glob.iglob(str(source), recursive=True))
+    files = sorted(p for p in candidates if p.suffix.lower() in IMAGE_SUFFIXES and p.is_file())
+    if not files:
+        raise FileNotFoundError(f"Tidak ada file gambar di '{source}'")
+    return files
+
+def _unique_names(paths):
+    # Nama output = nama file tanpa ekstensi; nama kembar diberi akhiran _2, _3, ...
+    counts = {}
+    for path in paths:
+        counts[path.stem] = counts.get(path.stem, 0) + 1
+        yield path.stem if counts[path.stem] == 1 else f"{path.stem}_{counts[path.stem]}"
+
+def iter_images(source=None, prefetch=2, workers=2):
     """
-    Menyimpan gambar ke file, membuat direktori jika perlu.
-    Menangani konversi tipe data (float -> ubyte) dan grayscale -> RGB.
+    Yield (nama, gambar) satu per satu.
+    source None -> gambar bawaan (load_images). source berupa direktori
+    atau pola glob -> setiap file gambar, di-decode di thread pool dengan
+    paling banyak `prefetch` decode berjalan di depan konsumen, sehingga
+    decode overlap dengan komputasi dan memori puncak ~ (prefetch + 1)
+    gambar berapa pun jumlah file.
     """
+    if source is None:
+        yield from load_images().items()
+        return
+
+    paths = list_image_files(source)
+    items = zip(_unique_names(paths), paths)
+    if prefetch <= 0:
+        for name, path in items:
+            yield name, decode_image(path)
+        return
+
+    pool = ThreadPoolExecutor(max(1, workers), thread_name_prefix="image-reader")
+    pending = deque()
+    try:
+        for name, path in itertools.islice(items, prefetch):
+            pending.append((name, pool.submit(decode_image, path)))
+        while pending:
+            name, future = pending.popleft()
+            # Decode berikutnya dimulai sebelum gambar ini dipakai konsumen
+            for next_name, next_path in itertools.islice(items, 1):
+                pending.append((next_name, pool.submit(decode_image, next_path)))
+            img = future.result()
+            del future
+            yield name, img
+            del img
+    finally:
+        # Generator ditutup lebih awal: batalkan decode yang belum jalan
+        for _, future in pending:
+            future.cancel()
+        pool.shutdown(wait=True)
+
+def _write_png(filepath, img, compress_level=6, promote_gray=True):
+    """Konversi ke uint8 (+ gray -> RGB jika promote_gray) lalu encode file."""
     filepath = Path(filepath)
     filepath.parent.mkdir(parents=True, exist_ok=True)
     
@@ -64,24 +294,184 @@ def save_img(filepath, img):
         img = img_as_ubyte(img)
         
     # Konversi grayscale ke RGB untuk konsistensi (opsional, tapi aman)
-    if img.ndim == 2:
+    if img.ndim == 2 and promote_gray:
         img = gray2rgb(img)
             
-    io.imsave(str(filepath), img)
+    # Level kompresi langsung ke imageio (plugin Pillow): kwargs plugin lewat
+    # io.imsave deprecated (FutureWarning) dan dihapus di skimage 0.27.
+    # Dengan level 6 (default Pillow) file-nya identik dengan io.imsave.
+    iio.imwrite(filepath, img, extension=filepath.suffix or ".png", compress_level=compress_level)
+
+class ImageWriter:
+    """
+    Penulis gambar dengan antrian terbatas dan thread pool, sehingga
+    konversi + encode PNG berjalan paralel dengan komputasi berikutnya.
+    submit() akan menunggu jika sudah ada max_pending job yang belum selesai.
+    workers=0 berarti menulis langsung (sinkron) di thread pemanggil.
+    """
+
+    def __init__(self, workers=2, max_pending=16, compress_level=6, promote_gray=True):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.compress_level = compress_level
+        self.promote_gray = promote_gray
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="png-writer") if workers > 0 else None
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._futures = []
+
+    def submit(self, filepath, img):
+        if self._pool is None:
+            _write_png(filepath, img, self.compress_level, self.promote_gray)
+            return
+        self._slots.acquire()
+        future = self._pool.submit(
+            _write_png, filepath, img, self.compress_level, self.promote_gray
+        )
+        future.add_done_callback(lambda _: self._slots.release())
+        with self._lock:
+            self._futures.append(future)
+
+    def flush(self):
+        """Tunggu semua job selesai; error pertama (jika ada) di-raise ulang."""
+        with self._lock:
+            futures, self._futures = self._futures, []
+        errors = [f.exception() for f in futures]
+        errors = [e for e in errors if e is not None]
+        if errors:
+            raise RuntimeError(
+                f"{len(errors)} gambar gagal ditulis; error pertama: {errors[0]!r}"
+            ) from errors[0]
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+
+    def clone(self):
+        """Writer baru dengan opsi yang sama (dipakai setelah fork)."""
+        return ImageWriter(self.workers, self.max_pending, self.compress_level, self.promote_gray)
+
+# Writer aktif untuk save_img; None -> tulis sinkron dengan opsi default
+_WRITER = None
+
+def start_writer(workers=2, max_pending=16, compress_level=6, promote_gray=True):
+    """Aktifkan writer untuk semua pemanggilan save_img berikutnya."""
+    global _WRITER
+    stop_writer()
+    _WRITER = ImageWriter(workers, max_pending, compress_level, promote_gray)
+    return _WRITER
+
+def writer_options():
+    """Opsi writer yang memengaruhi file PNG (ikut fingerprint manifest)."""
+    writer = _WRITER or ImageWriter(workers=0)
+    return {"compress_level": writer.compress_level, "promote_gray": writer.promote_gray}
+
+def writer_workers():
+    """Jumlah thread writer background yang aktif (0 = tulis sinkron)."""
+    return 0 if _WRITER is None else _WRITER.workers
+
+def flush_writer():
+    """Tunggu semua gambar tertulis dan munculkan error-nya (no-op tanpa writer)."""
+    if _WRITER is not None:
+        _WRITER.flush()
+
+def stop_writer():
+    global _WRITER
+    writer, _WRITER = _WRITER, None
+    if writer is not None:
+        writer.close()
+
+def _reset_writer_after_fork():
+    # Thread pool tidak ikut ter-fork; proses anak butuh writer sendiri
+    global _WRITER
+    if _WRITER is not None:
+        _WRITER = _WRITER.clone()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_writer_after_fork)
+
+def save_img(filepath, img):
+    """
+    Menyimpan gambar ke file, membuat direktori jika perlu.
+    Menangani konversi tipe data (float -> ubyte) dan grayscale -> RGB.
+    Jika writer aktif (start_writer), penulisan berjalan di background;
+    panggil flush_writer() sebelum memakai hasilnya.
+    """
+    if _WRITER is not None:
+        _WRITER.submit(filepath, img)
+    else:
+        _write_png(filepath, img)
+
+def add_writer_args(parser):
+    """Opsi CLI untuk writer PNG."""
+    parser.add_argument(
+        "--write-workers", type=int, default=0,
+        help="Jumlah thread penulis PNG di background (0 = sinkron)."
+    )
+    parser.add_argument(
+        "--png-compress", type=int, default=6, choices=range(10), metavar="0-9",
+        help="Level kompresi PNG (0 = tercepat, 9 = terkecil). Default: 6."
+    )
+    parser.add_argument(
+        "--no-gray-rgb", action="store_true",
+        help="Simpan gambar grayscale sebagai PNG 1 channel (tanpa gray2rgb)."
+    )
+    return parser
 
-def save_params_to_csv(filepath, params_list):
+def start_writer_from_args(args):
+    return start_writer(
+        workers=args.write_workers, compress_level=args.png_compress,
+        promote_gray=not args.no_gray_rgb,
+    )
+
+def load_comparison_tiles(comparison_plots):
+    """
+    Entri comparison_plots yang berupa callable (output yang dilewati oleh
+    mode inkremental) baru dihitung di sini, yaitu hanya jika comparison
+    memang digambar ulang, dengan cara yang sama seperti entri yang dihitung
+    run ini; comparison re-run parsial jadi identik dengan run penuh.
+    Callable yang mengembalikan None dilewati.
+    """
+    tiles = {}
+    for label, tile in comparison_plots.items():
+        if callable(tile):
+            tile = tile()
+            if tile is None:
+                continue
+        tiles[label] = tile
+    return tiles
+
+def save_params_to_csv(filepath, params_list, columns=None):
     """
     Menyimpan daftar dictionary parameter ke file CSV.
+    columns (opsional) menentukan urutan kolom.
     """
     filepath = Path(filepath)
-    df = pd.DataFrame(params_list)
+    df = pd.DataFrame(params_list, columns=columns)
     df.to_csv(filepath, index=False)
     print(f"\nParameter disimpan di: {filepath.name}")
 
-def plot_comparison(images_dict, title, filepath):
+def plot_comparison(images_dict, title, filepath, backend="mosaic"):
     """
     Membuat plot perbandingan hasil image dalam 2 BARIS dan menyimpannya ke file.
+    backend="mosaic" (default) menyusun grid langsung sebagai array uint8
+    (mosaic.compose_grid, tanpa matplotlib); backend="matplotlib" memakai
+    subplot matplotlib untuk output kualitas publikasi.
     """
+    filepath = Path(filepath)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+
+    if backend == "mosaic":
+        canvas = mosaic.compose_grid(images_dict, title, n_rows=2)
+        save_img(filepath, canvas)
+        print(f"Comparison plot disimpan di: {filepath.name}")
+        return
+    if backend != "matplotlib":
+        raise ValueError(f"backend tidak dikenal: {backend}")
+
     n = len(images_dict)
     
     n_rows = 2
@@ -102,46 +492,47 @@ def plot_comparison(images_dict, title, filepath):
         
     fig.suptitle(title, fontsize=16)
     
-    filepath = Path(filepath)
-    filepath.parent.mkdir(parents=True, exist_ok=True)
     plt.savefig(filepath)
     print(f"Comparison plot disimpan di: {filepath.name}")
     plt.close()
 
-def create_marked_image(image, coords, color='r', marker_size=10):
+def _disk_offsets(radius):
+    """Offset (dy, dx) semua piksel di dalam lingkaran berjari-jari radius."""
+    r = int(np.ceil(radius))
+    dy, dx = np.mgrid[-r:r + 1, -r:r + 1]
+    inside = dy ** 2 + dx ** 2 <= radius ** 2
+    return dy[inside], dx[inside]
+
+def create_marked_image(image, coords, color='r', radius=2, alpha=0.7):
     """
     Menggambar keypoints (koordinat) pada gambar dan mengembalikannya 
-    sebagai numpy array.
+    sebagai numpy array RGB float dengan resolusi asli gambar.
+    Setiap titik digambar sebagai lingkaran (radius piksel) yang di-blend
+    dengan warna `color` (nama/hex warna matplotlib atau tuple RGB 0-1).
     """
-    
-    is_gray = False
-    if image.ndim == 2:
-        image = gray2rgb(image) # Ubah ke RGB agar bisa ditandai warna
-        is_gray = True
-
-    # Buat plot di memory
-    fig, ax = plt.subplots(figsize=(8, 8))
-    
-    # Tampilkan gambar
-    if is_gray:
-        ax.imshow(image, cmap='gray')
+    marked = precision.as_float(image)
+    if marked.ndim == 2:
+        marked = gray2rgb(marked) # Ubah ke RGB agar bisa ditandai warna
     else:
-        ax.imshow(image)
-    
-    # Gambar koordinat. Plot butuh (x, y) padahal coords (row, col)
-    # Jadi kita balik: coords[:, 1] adalah x, coords[:, 0] adalah y
-    ax.scatter(coords[:, 1], coords[:, 0], c=color, s=marker_size, 
-               marker='.', edgecolor='none', alpha=0.7)
-    ax.axis('off')
-    
-    # Simpan ke buffer memory
-    buf = skio.BytesIO()
-    # bbox_inches='tight' dan pad_inches=0 untuk hapus border putih
-    plt.savefig(buf, format='png', bbox_inches='tight', pad_inches=0)
-    buf.seek(0)
-    
-    # Baca kembali sebagai image array
-    marked_img = io.imread(buf)
-    plt.close(fig) # Tutup plot agar tidak tampil di notebook
-    
-    return marked_img
\ No newline at end of file
+        marked = marked[..., :3].copy()
+
+    coords = np.asarray(coords)
+    if coords.size == 0:
+        return marked
+
+    # Semua piksel marker dihitung sekaligus: (N titik) x (K offset lingkaran)
+    centers = np.rint(coords[:, :2]).astype(np.intp)
+    dy, dx = _disk_offsets(radius)
+    rr = (centers[:, 0, None] + dy).ravel()
+    cc = (centers[:, 1, None] + dx).ravel()
+
+    h, w = marked.shape[:2]
+    valid = (rr >= 0) & (rr < h) & (cc >= 0) & (cc < w)
+
+    # Mask agar piksel yang tertimpa beberapa marker hanya di-blend sekali
+    mask = np.zeros((h, w), dtype=bool)
+    mask[rr[valid], cc[valid]] = True
+
+    rgb = np.asarray(to_rgb(color), dtype=marked.dtype)
+    marked[mask] = (1 - alpha) * marked[mask] + alpha * rgb
+    return marked